@@ -6,9 +6,21 @@ from .function_utils import (
     export_to_table,
     export_to_vector_file,
 )
-from .empirical_threshold_functions import calculate_ExperienceValueMethod_scores
+from .empirical_threshold_functions import (
+    calculate_ExperienceValueMethod_scores,
+    ExperienceValueScoringSession,
+    stream_ExperienceValueMethod_scores,
+    progressive_Score_interpolation,
+)
 from .background_level_functions import (
     process_background_value_method,
     calculate_backgroundLevel,
+    anomaly_flags_to_glyphs,
+    ANOMALY_RULES,
+    ANOMALY_GLYPHS,
+)
+from .principal_component_functions import (
+    return_PCA_results,
+    recommend_PC_interpolation,
+    progressive_PC_interpolation,
 )
-from .principal_component_functions import return_PCA_results
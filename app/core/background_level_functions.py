@@ -1,9 +1,10 @@
 import logging
 import numpy as np
+import pandas as pd
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
-from utils import NIS_indicators, Drawing_specifications
+from utils import NIS_indicators, Drawing_specifications, two_class_boundary
 from .function_utils import (
     add_north_arrow,
     add_scalebar,
@@ -39,17 +40,15 @@ def draw_ECDF(
     return fig
 
 
-def draw_KMeans_cluster(data, param_name="", unit="", random_state=0):
+def draw_KMeans_cluster(data, param_name="", unit=""):
     import numpy as np
-    from sklearn.cluster import KMeans
 
     """
-    Perform KMeans clustering on an input set of data, returning cutoffs and plotting objects.
+    Split the input data into two clusters (exact 1-D two-means), returning cutoffs and plotting objects.
 
     :param data: 输入的一组数据（列表、NumPy 数组等）
     :param param_name: 参数名称（用于显示）
     :param unit: 单位（用于坐标轴标签）
-    :param random_state: KMeans 随机种子
     :return: (boundary, FigureCanvas)
     """
     # 将数据转换为二维数组
@@ -57,11 +56,9 @@ def draw_KMeans_cluster(data, param_name="", unit="", random_state=0):
     if len(data) == 0:
         logging.error("KMEANS input data cannot be empty")
 
-    # KMeans
-    kmeans = KMeans(n_clusters=2, random_state=random_state).fit(data)
-    centers = kmeans.cluster_centers_.flatten()
+    # 精确的一维两类划分（KMeans 目标函数的全局最优解），结果确定
     # Use the mean of the clustering center as the cut-off point
-    boundary = np.mean(centers)
+    boundary, centers = two_class_boundary(data)
 
     fig = Figure(figsize=(8, 6), dpi=90)
     ax = fig.add_subplot(111)
@@ -157,15 +154,7 @@ def calculate_backgroundLevel(data, boundarys):
     gdf = new_data.get("gdf")
     result_gdf = anomaly_identification(gdf, boundarys)
     anomaly_figs = []
-    headers = [
-        ("Abnormally Low Radon", NIS_indicators.Radon),
-        ("Abnormally High VOCs", NIS_indicators.VOCs),
-        ("Abnormally High CO2", NIS_indicators.CO2),
-        ("Abnormally Low O2", NIS_indicators.O2),
-        ("Abnormally High CH4", NIS_indicators.CH4),
-        ("Abnormally High Functional Genes", NIS_indicators.FG),
-    ]
-    for column, indicator in headers:
+    for column, indicator, _ in ANOMALY_RULES:
         anomaly_figs.append(
             (
                 indicator,
@@ -183,85 +172,55 @@ def calculate_backgroundLevel(data, boundarys):
     return new_data
 
 
+# 背景值法的异常判别规则：(结果列名, 指标, 判为异常的比较方式)
+# 氡气、氧气为低值异常（≤阈值），其余为高值异常
+ANOMALY_RULES = [
+    ("Abnormally Low Radon", NIS_indicators.Radon, np.less_equal),
+    ("Abnormally High VOCs", NIS_indicators.VOCs, np.greater),
+    ("Abnormally Low O2", NIS_indicators.O2, np.less_equal),
+    ("Abnormally High CO2", NIS_indicators.CO2, np.greater_equal),
+    ("Abnormally High CH4", NIS_indicators.CH4, np.greater_equal),
+    ("Abnormally High Functional Genes", NIS_indicators.FG, np.greater_equal),
+]
+
+
+# 异常判别结果以 int8 存储，只在表格显示和导出时转换为符号
+ANOMALY_NO_DATA = -1
+ANOMALY_NORMAL = 0
+ANOMALY_ABNORMAL = 1
+ANOMALY_GLYPHS = {ANOMALY_ABNORMAL: "√", ANOMALY_NORMAL: "×", ANOMALY_NO_DATA: "⚪"}
+
+
 def anomaly_identification(gdf, boundarys):
-    gdf["Abnormally Low Radon"] = gdf[NIS_indicators.Radon.value.name].apply(
-        lambda x: (
-            "×"
-            if x is not None
-            and x > boundarys.get(NIS_indicators.Radon)  # 大于阈值时赋值为 1
-            else (
-                "√"
-                if x is not None
-                and x <= boundarys.get(NIS_indicators.Radon)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
-        )
-    )
-    gdf["Abnormally High VOCs"] = gdf[NIS_indicators.VOCs.value.name].apply(
-        lambda x: (
-            "√"
-            if x is not None
-            and x > boundarys.get(NIS_indicators.VOCs)  # 大于阈值时赋值为 1
-            else (
-                "×"
-                if x is not None
-                and x <= boundarys.get(NIS_indicators.VOCs)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
-        )
-    )
-    gdf["Abnormally Low O2"] = gdf[NIS_indicators.O2.value.name].apply(
-        lambda x: (
-            "×"
-            if x is not None
-            and x > boundarys.get(NIS_indicators.O2)  # 大于阈值时赋值为 1
-            else (
-                "√"
-                if x is not None
-                and x <= boundarys.get(NIS_indicators.O2)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
-        )
-    )
-    gdf["Abnormally High CO2"] = gdf[NIS_indicators.CO2.value.name].apply(
-        lambda x: (
-            "√"
-            if x is not None
-            and x >= boundarys.get(NIS_indicators.CO2)  # 大于阈值时赋值为 1
-            else (
-                "×"
-                if x is not None
-                and x < boundarys.get(NIS_indicators.CO2)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
-        )
-    )
-    gdf["Abnormally High CH4"] = gdf[NIS_indicators.CH4.value.name].apply(
-        lambda x: (
-            "√"
-            if x is not None
-            and x >= boundarys.get(NIS_indicators.CH4)  # 大于阈值时赋值为 1
-            else (
-                "×"
-                if x is not None
-                and x < boundarys.get(NIS_indicators.CH4)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
-        )
-    )
-    gdf["Abnormally High Functional Genes"] = gdf[NIS_indicators.FG.value.name].apply(
-        lambda x: (
-            "√"
-            if x is not None
-            and x >= boundarys.get(NIS_indicators.FG)  # 大于阈值时赋值为 1
-            else (
-                "×"
-                if x is not None
-                and x < boundarys.get(NIS_indicators.FG)  # 小于或等于阈值时赋值为 0
-                else "⚪"
-            )
+    """
+    按列判别各指标是否异常：异常为 ANOMALY_ABNORMAL，正常为 ANOMALY_NORMAL，
+    无数据（空值或NaN）或未设置阈值为 ANOMALY_NO_DATA
+    :param gdf: 采样点数据
+    :param boundarys: 各指标的阈值 {NIS_indicators: 阈值}，阈值为 None 时不判别
+    :return: 添加了判别结果列（int8）的 gdf
+    """
+    for column, indicator, is_anomalous in ANOMALY_RULES:
+        values = pd.to_numeric(gdf[indicator.value.name], errors="coerce").to_numpy(
+            dtype=float, na_value=np.nan
         )
-    )
+        boundary = boundarys.get(indicator)
+        if boundary is None:
+            gdf[column] = np.full(len(values), ANOMALY_NO_DATA, dtype=np.int8)
+            continue
+        flags = np.where(
+            is_anomalous(values, boundary), ANOMALY_ABNORMAL, ANOMALY_NORMAL
+        ).astype(np.int8)
+        flags[np.isnan(values)] = ANOMALY_NO_DATA
+        gdf[column] = flags
+    return gdf
+
+
+def anomaly_flags_to_glyphs(gdf):
+    """返回判别结果列转换为符号（√、×、⚪）的副本，用于导出"""
+    gdf = gdf.copy()
+    for column, _, _ in ANOMALY_RULES:
+        if column in gdf:
+            gdf[column] = gdf[column].map(ANOMALY_GLYPHS)
     return gdf
 
 
@@ -283,18 +242,16 @@ def backgroundValue_anomaly_fig(
 
     boundary_polygon_gdf = gpd.read_file(boundary_polygon_file).to_crs(epsg=4547)
     boundary_polygon_gdf.plot(ax=ax, facecolor="none", edgecolor="red")
-    colors = {"√": "red", "×": "green", "⚪": "white"}
-    gdf["color"] = gdf[column].map(colors)
-    all_null = (gdf["color"] == "white").all()
-    if all_null:
+    flags = gdf[column].to_numpy()
+    mask = flags != ANOMALY_NO_DATA
+    if not mask.any():
         return None
-    mask = gdf["color"] != "white"
     ax.scatter(
-        gdf[mask].geometry.x,
-        gdf[mask].geometry.y,
+        gdf.geometry.x[mask],
+        gdf.geometry.y[mask],
         marker="o",
         s=30,
-        color=gdf[mask]["color"],
+        color=np.where(flags[mask] == ANOMALY_ABNORMAL, "red", "green"),
     )
     add_north_arrow(ax)
     add_scalebar(ax, location="lower left")
@@ -6,7 +6,17 @@ import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
 
-from utils import NIS_indicators, Drawing_specifications
+from utils import (
+    NIS_indicators,
+    Drawing_specifications,
+    progressive_interpolation,
+    polygon_mask,
+    ScoreTable,
+    compile_score_config,
+    normalize_units,
+    GridSpec,
+    PROGRESSIVE_LEVELS,
+)
 from .function_utils import (
     point_dataset_preprocess,
     boundary_file_preprocess,
@@ -28,48 +38,59 @@ matplotlib.use("QtAgg")
 #     "H2S",
 # ]  # 氡气 VOCs CO2 O2 CH4 H2 H2S
 # 评分区间严格升序排列；得分数量=区间分界值数量+1；使用bool控制该分界值在左区间的开闭状态
-Radon_score = {
-    "breakpoint": [(15, True), (150, True), (1500, True)],
-    "score": [11, 3, 1, 0],
-}  # unit:Bq/m3
-VOCs_score = {
-    "breakpoint": [(0.1, False), (1, False), (10, False), (100, False)],
-    "score": [0, 1, 2, 6, 22],
-}  # unit:ppm
-CO2_score = {
-    "breakpoint": [(0.01, False), (0.05, False), (0.1, False)],
-    "score": [0, 2, 6, 22],
-}  # unit:%
-O2_score = {
-    "breakpoint": [(0.01, True), (0.1, True), (0.19, True)],
-    "score": [11, 3, 1, 0],
-}  # unit:%
-CH4_score = {
-    "breakpoint": [(0.0001, False), (0.0025, False), (0.01, False), (0.05, False)],
-    "score": [0, 1, 2, 6, 22],
-}  # unit:%
-H2_score = {
-    "breakpoint": [(100, False), (500, False), (1000, False)],
-    "score": [0, 1, 3, 11],
-}  # unit:ppm
-H2S_score = {
-    "breakpoint": [(1, False), (5, False), (10, False)],
-    "score": [0, 1, 3, 11],
-}  # unit:ppm
-abnormal_score_config = dict(
-    zip(
-        [indicator.value.name for indicator in NIS_indicators],
-        [
-            Radon_score,
-            VOCs_score,
-            CO2_score,
-            O2_score,
-            CH4_score,
-            H2S_score,
-            H2_score,
-        ],
+Radon_score = ScoreTable(
+    NIS_indicators.Radon.value.name,
+    breakpoints=[(15, True), (150, True), (1500, True)],
+    scores=[11, 3, 1, 0],
+    unit=NIS_indicators.Radon.value.unit,
+)  # unit:Bq/m3
+VOCs_score = ScoreTable(
+    NIS_indicators.VOCs.value.name,
+    breakpoints=[(0.1, False), (1, False), (10, False), (100, False)],
+    scores=[0, 1, 2, 6, 22],
+    unit="ppm",
+)  # unit:ppm
+CO2_score = ScoreTable(
+    NIS_indicators.CO2.value.name,
+    breakpoints=[(0.01, False), (0.05, False), (0.1, False)],
+    scores=[0, 2, 6, 22],
+    unit="v/v",
+)  # unit:体积比（1%、5%、10%）
+O2_score = ScoreTable(
+    NIS_indicators.O2.value.name,
+    breakpoints=[(0.01, True), (0.1, True), (0.19, True)],
+    scores=[11, 3, 1, 0],
+    unit="v/v",
+)  # unit:体积比（1%、10%、19%）
+CH4_score = ScoreTable(
+    NIS_indicators.CH4.value.name,
+    breakpoints=[(0.0001, False), (0.0025, False), (0.01, False), (0.05, False)],
+    scores=[0, 1, 2, 6, 22],
+    unit="v/v",
+)  # unit:体积比（0.01%、0.25%、1%、5% 即爆炸下限）
+H2_score = ScoreTable(
+    NIS_indicators.H2.value.name,
+    breakpoints=[(100, False), (500, False), (1000, False)],
+    scores=[0, 1, 3, 11],
+)  # unit:ppm（与输入数据单位相同，不换算）
+H2S_score = ScoreTable(
+    NIS_indicators.H2S.value.name,
+    breakpoints=[(1, False), (5, False), (10, False)],
+    scores=[0, 1, 3, 11],
+)  # unit:ppm（与输入数据单位相同，不换算）
+# 评分表按指标名绑定，可用 load_score_config 从 JSON/TOML 文件读取地区性的评分配置
+abnormal_score_config = {
+    table.indicator: table
+    for table in (
+        Radon_score,
+        VOCs_score,
+        CO2_score,
+        O2_score,
+        CH4_score,
+        H2S_score,
+        H2_score,
     )
-)
+}
 
 
 def calculate_score(
@@ -84,6 +105,7 @@ def calculate_score(
     返回:
     dict: 包含各指标得分缺失数据为None和总得分的字典
     """
+    abnormal_score_config = compile_score_config(abnormal_score_config)
     result = {}
     other_soil_gas = [
         NIS_indicators.VOCs.value.name,
@@ -102,23 +124,10 @@ def calculate_score(
             result[f"{indicator}_Score"] = None
             continue
 
-        value = sample_data[indicator]
-        config = abnormal_score_config[indicator]
-        breakpoints = config["breakpoint"]
-        scores = config["score"]
-
-        # 区间判断逻辑
-        index = None
-        for i, (bp, left_incl) in enumerate(breakpoints):
-            if (value < bp) or (value == bp and not left_incl):
-                index = i
-                break
-        else:
-            index = len(breakpoints)
-
         # 记录得分
-        score = scores[index]
-        result[f"{indicator}_Score"] = score
+        result[f"{indicator}_Score"] = abnormal_score_config[indicator].score(
+            sample_data[indicator]
+        )
     # 计算其他土壤气得分
     for indicator in other_soil_gas:
         if result[f"{indicator}_Score"] is not None:
@@ -135,73 +144,357 @@ def calculate_score(
     return result
 
 
+def calculate_scores(data, abnormal_score_config: dict = abnormal_score_config):
+    """
+    按列向量化计算所有采样点的得分，结果与逐行调用 calculate_score 一致
+
+    参数:
+    data (DataFrame): 采样点数据，列为指标名；缺失的列或NaN视为缺失数据
+    abnormal_score_config (dict): 各指标的评分区间
+
+    返回:
+    DataFrame: 与 data 索引一致，列为各指标得分（缺失为NaN）、其他土壤气得分和总得分
+    """
+    abnormal_score_config = compile_score_config(abnormal_score_config)
+    result = pd.DataFrame(index=data.index)
+    for indicator, table in abnormal_score_config.items():
+        if indicator in data:
+            values = pd.to_numeric(data[indicator], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+        else:
+            values = np.full(len(data), np.nan)
+        result[f"{indicator}_Score"] = table(values)
+    return _total_scores(result)
+
+
+def _total_scores(result):
+    """由各指标得分列（原地）计算其他土壤气得分和总得分"""
+    other_soil_gas = [
+        NIS_indicators.VOCs.value.name,
+        NIS_indicators.CO2.value.name,
+        NIS_indicators.O2.value.name,
+        NIS_indicators.CH4.value.name,
+        NIS_indicators.H2.value.name,
+        NIS_indicators.H2S.value.name,
+    ]
+    # 计算其他土壤气得分（缺失的指标不计分）
+    result["The_other_soil_gas_scores"] = (
+        result[[f"{indicator}_Score" for indicator in other_soil_gas]]
+        .fillna(0)
+        .sum(axis=1)
+        .astype(float)
+    )
+    # 只有其他土壤气得分≥6且测量了Radon的点位才计算总得分
+    radon_score = result["Radon_Score"]
+    result["All_indicators_Scores"] = (
+        result["The_other_soil_gas_scores"] + radon_score
+    ).where((result["The_other_soil_gas_scores"] >= 6) & radon_score.notna())
+    return result
+
+
+# 分批评分时每批读取的要素数
+ETA_STREAM_BATCH_SIZE = 50_000
+
+
 def calculate_ExperienceValueMethod_scores(
-    gdf, options, boundary_file, abnormal_score_config: dict = abnormal_score_config
+    gdf,
+    options,
+    boundary_file,
+    abnormal_score_config: dict = abnormal_score_config,
+    include_pollution_level_fig=True,
+    units: dict = None,
 ):
-    new_gdf = point_dataset_preprocess(gdf, options)
-    boundary_gdf = boundary_file_preprocess(boundary_file)
-    # 确定需要处理的指标列
+    """
+    :param units: 各指标数据的单位 {指标名: 单位}，默认为 NIS_indicators 中的单位；
+        评分前按各评分表的单位换算
+    """
+    session = ExperienceValueScoringSession(
+        gdf, options, boundary_file, abnormal_score_config, units
+    )
+    return session.result_dict(include_pollution_level_fig)
+
+
+def stream_ExperienceValueMethod_scores(
+    point_dataset,
+    options,
+    output_path,
+    abnormal_score_config: dict = abnormal_score_config,
+    units: dict = None,
+    batch_size=ETA_STREAM_BATCH_SIZE,
+):
+    """
+    分批读取、评分并写出采样点，内存中只保留一个批次，适用于点位很多的调查数据
+    :param point_dataset: 采样点数据文件
+    :param options: 指标名与数据列名的对应关系
+    :param output_path: 输出文件：.gpkg 为逐批追加写入的 GeoPackage；
+        .parquet 为目录，每批写入一个 part-xxxxx.parquet 文件（需要 pyarrow）
+    :param abnormal_score_config: 各指标的评分表
+    :param units: 各指标数据的单位 {指标名: 单位}，默认为 NIS_indicators 中的单位
+    :param batch_size: 每批读取的要素数，默认为 ETA_STREAM_BATCH_SIZE
+    :return: 汇总计数 dict：读取和评分的点位数、各污染类型的点位数、污染范围内的点位数
+    """
+    import pyogrio
+    from pathlib import Path
+
+    abnormal_score_config = compile_score_config(abnormal_score_config)
+    source_units = _source_units(units)
     indicators = list(abnormal_score_config.keys())
     subset = safe_remove(indicators.copy(), "Radon")
-    new_gdf = new_gdf.dropna(subset=subset)
-    # * 数据单位转换(针对测试数据)
-    new_gdf["VOCs"] = new_gdf["VOCs"].apply(lambda x: x / 1000)
-    new_gdf["CO2"] = new_gdf["CO2"].apply(lambda x: x / 1000000)
-
-    # *
-    # 定义行处理函数
-    def process_row(row):
-        # 提取当前行的指标数据
-        sample_data = row[indicators].dropna().to_dict()  # 自动处理NaN值
-        # 计算得分
-        result = calculate_score(sample_data)
-        return pd.Series(result)
-
-    # 执行计算并合并结果
-    new_gdf = new_gdf.join(new_gdf.apply(process_row, axis=1))
-    new_gdf["Contamination_type"] = new_gdf.apply(
-        Distinguishing_type_of_contamination, axis=1
+    output_path = Path(output_path)
+    to_parquet = output_path.suffix.lower() == ".parquet"
+    if to_parquet:
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    summary = {"points_read": 0, "points_scored": 0}
+    summary.update(
+        {contamination_type: 0 for contamination_type in CONTAMINATION_TYPES}
     )
-    new_gdf["Scope_of_contamination"] = new_gdf.apply(
-        Distinguishing_scope_of_contamination, axis=1
+    summary["Scope_of_contamination"] = 0
+    n_features = pyogrio.read_info(point_dataset)["features"]
+    written = 0
+    for start in range(0, n_features, batch_size):
+        batch = point_dataset_preprocess(
+            point_dataset, options, rows=slice(start, start + batch_size)
+        )
+        summary["points_read"] += len(batch)
+        batch = batch.dropna(subset=subset)
+        if batch.empty:
+            continue
+        # 全部为空值的指标列在各批次中的类型可能不同，统一为浮点型以保持输出字段类型一致
+        for indicator in indicators:
+            if indicator in batch:
+                batch[indicator] = pd.to_numeric(batch[indicator], errors="coerce")
+        batch = _score_points(batch, abnormal_score_config, source_units)
+
+        summary["points_scored"] += len(batch)
+        for contamination_type, count in (
+            batch["Contamination_type"].value_counts().items()
+        ):
+            summary[contamination_type] += int(count)
+        summary["Scope_of_contamination"] += int(
+            (batch["Scope_of_contamination"] == 1).sum()
+        )
+        if to_parquet:
+            batch.to_parquet(output_path / f"part-{written:05d}.parquet")
+        else:
+            # GeoPackage 的字段名不区分大小写，与指标名只有大小写不同的原始列不再重复写出
+            batch = batch.drop(
+                columns=[
+                    value
+                    for key, value in options.items()
+                    if value in batch and value != key and value.lower() == key.lower()
+                ]
+            )
+            batch.to_file(output_path, driver="GPKG", mode="w" if written == 0 else "a")
+        written += 1
+    return summary
+
+
+class ExperienceValueScoringSession:
+    """
+    经验值法的增量评分：预处理后的数据和各指标得分列保存在内存中，
+    修改某个指标的评分表时只重新计算该指标得分、总得分和污染分类，并记录需要重新生成的结果图
+    """
+
+    def __init__(
+        self,
+        gdf,
+        options,
+        boundary_file,
+        abnormal_score_config: dict = abnormal_score_config,
+        units: dict = None,
+    ):
+        """
+        :param gdf: 采样点数据文件
+        :param options: 指标名与数据列名的对应关系
+        :param boundary_file: 场地边界文件
+        :param abnormal_score_config: 各指标的评分表
+        :param units: 各指标数据的单位 {指标名: 单位}，默认为 NIS_indicators 中的单位
+        """
+        self.abnormal_score_config = compile_score_config(abnormal_score_config)
+        new_gdf = point_dataset_preprocess(gdf, options)
+        self.boundary_gdf = boundary_file_preprocess(boundary_file)
+        # 确定需要处理的指标列
+        indicators = list(self.abnormal_score_config.keys())
+        subset = safe_remove(indicators.copy(), "Radon")
+        new_gdf = new_gdf.dropna(subset=subset)
+        # 保留原始单位的数据，以便评分表单位改变时重新换算
+        self.source_units = _source_units(units)
+        self._raw = new_gdf[
+            [indicator for indicator in indicators if indicator in new_gdf]
+        ].copy()
+        self.gdf = _score_points(new_gdf, self.abnormal_score_config, self.source_units)
+        self.figures = {}
+        self.stale_figures = set(ANOMALY_FIGURES)
+
+    def update_score_table(self, indicator, table):
+        """
+        替换一个指标的评分表，只重新计算该指标的得分及由其派生的总得分和分类
+        :param indicator: 指标名，须为已有评分表的指标
+        :param table: ScoreTable 或评分表字典
+        :return: 因此需要重新生成的结果图名称集合
+        """
+        if indicator not in self.abnormal_score_config:
+            raise ValueError(f"No score table for indicator {indicator!r}")
+        table = compile_score_config({indicator: table})[indicator]
+        before = _anomaly_figure_inputs(self.gdf)
+        self.abnormal_score_config[indicator] = table
+
+        if indicator in self._raw:
+            column = self._raw[[indicator]].copy()
+            normalize_units(column, self.source_units, {indicator: table.unit})
+            self.gdf[indicator] = column[indicator]
+            values = pd.to_numeric(self.gdf[indicator], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+        else:
+            values = np.full(len(self.gdf), np.nan)
+        self.gdf[f"{indicator}_Score"] = table(values)
+        _total_scores(self.gdf)
+        _classify(self.gdf)
+
+        after = _anomaly_figure_inputs(self.gdf)
+        changed = {name for name in before if not before[name].equals(after[name])}
+        self.stale_figures |= changed
+        return changed
+
+    def result_dict(self, include_pollution_level_fig=True):
+        """
+        返回与 calculate_ExperienceValueMethod_scores 相同格式的结果，只重新生成过期的结果图
+        :param include_pollution_level_fig: 是否生成污染程度插值图
+        """
+        names = [
+            name
+            for name in ANOMALY_FIGURES
+            if name in self.stale_figures
+            and (include_pollution_level_fig or name != "pollution_level_fig")
+        ]
+        self.figures.update(
+            experienceValue_anomaly_fig(self.gdf, self.boundary_gdf, figures=names)
+        )
+        self.stale_figures.difference_update(names)
+
+        result_dict = {}
+        result_dict["gdf"] = self.gdf
+        result_dict["outline_dataset"] = self.boundary_gdf
+        result_dict.update(
+            {
+                name: fig
+                for name, fig in self.figures.items()
+                if name not in self.stale_figures
+            }
+        )
+        return result_dict
+
+
+def _source_units(units=None):
+    """各指标数据的单位，默认为 NIS_indicators 中的单位"""
+    source_units = {
+        indicator.value.name: indicator.value.unit for indicator in NIS_indicators
+    }
+    source_units.update(units or {})
+    return source_units
+
+
+def _score_points(new_gdf, abnormal_score_config, source_units):
+    """数据单位转换为评分表的单位后，按列计算得分并划分污染类型与范围"""
+    normalize_units(
+        new_gdf,
+        source_units,
+        {name: table.unit for name, table in abnormal_score_config.items()},
     )
+    new_gdf = new_gdf.join(calculate_scores(new_gdf, abnormal_score_config))
+    _classify(new_gdf)
+    return new_gdf
 
-    result_dict = {}
-    result_dict["gdf"] = new_gdf
-    result_dict["outline_dataset"] = boundary_gdf
-    fig_dict = experienceValue_anomaly_fig(new_gdf, boundary_gdf)
-    result_dict.update(fig_dict)
-    return result_dict
+
+def _classify(gdf):
+    gdf["Contamination_type"] = Distinguishing_type_of_contamination(gdf)
+    gdf["Scope_of_contamination"] = Distinguishing_scope_of_contamination(gdf)
+
+
+# 经验值法的结果图，按生成顺序排列
+ANOMALY_FIGURES = ["source_fig", "scope_fig", "exceed_fig", "pollution_level_fig"]
+
+
+def _anomaly_figure_inputs(gdf):
+    """各结果图依赖的（由得分派生的）数据，数据不变时结果图无需重新生成"""
+    return {
+        "source_fig": gdf["Contamination_type"],
+        "scope_fig": gdf["Scope_of_contamination"],
+        "exceed_fig": gdf["The_other_soil_gas_scores"] >= 6,
+        "pollution_level_fig": gdf["All_indicators_Scores"].fillna(
+            gdf["The_other_soil_gas_scores"]
+        ),
+    }
 
 
 def experienceValue_anomaly_fig(
     gdf,
     boundary_gdf,
+    include_pollution_level_fig=True,
+    figures=None,
 ):
+    """
+    :param figures: 只生成这些结果图（见 ANOMALY_FIGURES），默认为全部
+    """
+    if figures is None:
+        figures = ANOMALY_FIGURES
     result_dict = {}
-    result_dict["source_fig"] = Plot_source_zone(gdf, boundary_gdf)
-    result_dict["scope_fig"] = Plot_scope_of_contamination(gdf, boundary_gdf)
-    result_dict["exceed_fig"] = Plot_anomaly_point(
-        gdf[gdf["The_other_soil_gas_scores"] >= 6], boundary_gdf
-    )
-    result_dict["pollution_level_fig"] = Score_interpolation(gdf, boundary_gdf)
+    if "source_fig" in figures:
+        result_dict["source_fig"] = Plot_source_zone(gdf, boundary_gdf)
+    if "scope_fig" in figures:
+        result_dict["scope_fig"] = Plot_scope_of_contamination(gdf, boundary_gdf)
+    if "exceed_fig" in figures:
+        result_dict["exceed_fig"] = Plot_anomaly_point(
+            gdf[gdf["The_other_soil_gas_scores"] >= 6], boundary_gdf
+        )
+    # 不预先计算时由界面调用 progressive_Score_interpolation 逐级渲染
+    if include_pollution_level_fig and "pollution_level_fig" in figures:
+        result_dict["pollution_level_fig"] = Score_interpolation(gdf, boundary_gdf)
     return result_dict
 
 
-def Distinguishing_scope_of_contamination(row):
-    if row["The_other_soil_gas_scores"] >= 1:
-        return 1
-    else:
-        return 0
+# 污染类型标签（按判定优先级排列）
+CONTAMINATION_TYPES = [
+    "Source_of_contamination",
+    "Suspected_source_of_contamination",
+    "Scores<6",
+]
 
 
-def Distinguishing_type_of_contamination(row):
-    if row["All_indicators_Scores"] >= 17 and row["Radon_Score"] >= 1:
-        return "Source_of_contamination"
-    elif row["All_indicators_Scores"] >= 6 and row["VOCs_Score"] >= 1:
-        return "Suspected_source_of_contamination"
-    else:
-        return "Scores<6"
+def Distinguishing_scope_of_contamination(scores):
+    """
+    按列判定污染范围：其他土壤气得分≥1为1，否则为0
+    :param scores: 含 The_other_soil_gas_scores 列的 DataFrame
+    :return: 分类（categorical）Series，类别为 [0, 1]
+    """
+    scope = np.where(scores["The_other_soil_gas_scores"] >= 1, 1, 0)
+    return pd.Series(pd.Categorical(scope, categories=[0, 1]), index=scores.index)
+
+
+def Distinguishing_type_of_contamination(scores):
+    """
+    按列判定污染类型，缺失（NaN）的得分不满足任何条件
+    :param scores: 含 All_indicators_Scores、Radon_Score、VOCs_Score 列的 DataFrame
+    :return: 分类（categorical）Series，类别为 CONTAMINATION_TYPES
+    """
+    all_scores = scores["All_indicators_Scores"].to_numpy(dtype=float)
+    radon_scores = scores["Radon_Score"].to_numpy(dtype=float)
+    vocs_scores = scores["VOCs_Score"].to_numpy(dtype=float)
+    contamination_type = np.select(
+        [
+            (all_scores >= 17) & (radon_scores >= 1),
+            (all_scores >= 6) & (vocs_scores >= 1),
+        ],
+        CONTAMINATION_TYPES[:2],
+        default=CONTAMINATION_TYPES[2],
+    )
+    return pd.Series(
+        pd.Categorical(contamination_type, categories=CONTAMINATION_TYPES),
+        index=scores.index,
+    )
 
 
 def Plot_source_zone(gdf, boundary_gdf):
@@ -358,16 +651,8 @@ def Plot_anomaly_point(gdf, boundary_gdf):
 
 
 def mask_with_polygon(grid_x, grid_y, grid_z, polygon):
-    from shapely.geometry import Point
-    import numpy as np
-
     # Create a mask
-    mask = np.zeros_like(grid_z, dtype=bool)
-    for i in range(grid_z.shape[0]):
-        for j in range(grid_z.shape[1]):
-            point = Point(grid_x[i, j], grid_y[i, j])
-            if polygon.contains(point):
-                mask[i, j] = True
+    mask = polygon_mask(grid_x, grid_y, polygon)
 
     # Apply the mask
     masked_grid_z = np.where(mask, grid_z, np.nan)
@@ -376,52 +661,86 @@ def mask_with_polygon(grid_x, grid_y, grid_z, polygon):
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.interpolate import griddata
 from shapely.ops import unary_union
 
 
-def Score_interpolation(gdf, boundary_gdf, method="linear"):
+def Score_interpolation(
+    gdf, boundary_gdf, method="linear", cell_size=None, max_cells=None
+):
+    for fig in progressive_Score_interpolation(
+        gdf,
+        boundary_gdf,
+        method=method,
+        cell_size=cell_size,
+        max_cells=max_cells,
+        levels=1,
+    ):
+        pass
+    return fig
+
+
+def progressive_Score_interpolation(
+    gdf,
+    boundary_gdf,
+    method="linear",
+    cell_size=None,
+    max_cells=None,
+    levels=PROGRESSIVE_LEVELS,
+):
+    """
+    由粗到细依次生成污染程度插值图，最后一张为目标分辨率
+    网格格点数由网格单元边长（米）决定，默认值见 GridSpec.from_cell_size
+    """
     try:
         boundary = boundary_gdf.copy()
         if gdf.crs != boundary.crs:
             gdf = gdf.to_crs(boundary.crs)
 
         # 生成插值网格
-        min_x, min_y, max_x, max_y = boundary.total_bounds
-        grid_x, grid_y = np.mgrid[min_x:max_x:300j, min_y:max_y:300j]
+        bounds = boundary.total_bounds
+        grid = GridSpec.from_cell_size(bounds, cell_size, max_cells)
         points = np.column_stack((gdf.geometry.x, gdf.geometry.y))
         values = gdf["All_indicators_Scores"].fillna(gdf["The_other_soil_gas_scores"])
-        grid_z = griddata(points, values, (grid_x, grid_y), method=method)
+        boundary_polygon = unary_union(boundary.geometry)
+        # 只插值边界内的格点，边界外为NaN
+        for grid_x, grid_y, masked_z in progressive_interpolation(
+            method,
+            points[:, 0],
+            points[:, 1],
+            values,
+            grid,
+            levels,
+            boundary=boundary_polygon,
+            crs=boundary.crs,
+        ):
+            yield _plot_score_surface(boundary, bounds, points, masked_z)
+    except Exception as e:
+        raise RuntimeError(f"Processing failed: {str(e)}")
 
-        # 应用掩膜
-        masked_z = mask_with_polygon(
-            grid_x, grid_y, grid_z, unary_union(boundary.geometry)
-        )
 
-        # 可视化
-        fig, ax = plt.subplots(figsize=(10, 8), dpi=90)
-        im = ax.imshow(
-            masked_z.T,
-            extent=(min_x, max_x, min_y, max_y),
-            origin="lower",
-            cmap="viridis",
-            interpolation="none",
-        )
-        add_north_arrow(ax)
-        add_scalebar(ax, location="lower left")
-        ax.scatter(points[:, 0], points[:, 1], c="red", s=4, label="Data Points")
-        cbar = plt.colorbar(im, ax=ax)
-        cbar.set_label("Contamination risk", rotation=270, labelpad=20)
-        cbar.ax.text(
-            0.5, 1.02, "High", ha="center", va="bottom", transform=cbar.ax.transAxes
-        )
-        cbar.ax.text(
-            0.5, -0.02, "Low", ha="center", va="top", transform=cbar.ax.transAxes
-        )
+def _plot_score_surface(boundary, bounds, points, masked_z):
+    min_x, min_y, max_x, max_y = bounds
+    # 可视化
+    fig = Figure(figsize=(10, 8), dpi=90)
+    ax = fig.add_subplot(111)
+    im = ax.imshow(
+        masked_z.T,
+        extent=(min_x, max_x, min_y, max_y),
+        origin="lower",
+        cmap="viridis",
+        interpolation="none",
+    )
+    add_north_arrow(ax)
+    add_scalebar(ax, location="lower left")
+    ax.scatter(points[:, 0], points[:, 1], c="red", s=4, label="Data Points")
+    cbar = fig.colorbar(im, ax=ax)
+    cbar.set_label("Contamination risk", rotation=270, labelpad=20)
+    cbar.ax.text(
+        0.5, 1.02, "High", ha="center", va="bottom", transform=cbar.ax.transAxes
+    )
+    cbar.ax.text(0.5, -0.02, "Low", ha="center", va="top", transform=cbar.ax.transAxes)
 
-        # Boundary drawing (efficient rendering with geopandas)
-        boundary.boundary.plot(ax=ax, color="red", lw=1, label="Boundary")
-        ax.legend()
-        return fig
-    except Exception as e:
-        raise RuntimeError(f"Processing failed: {str(e)}")
+    # Boundary drawing (efficient rendering with geopandas)
+    boundary.boundary.plot(ax=ax, color="red", lw=1, label="Boundary")
+    ax.legend()
+    return fig
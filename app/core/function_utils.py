@@ -82,10 +82,14 @@ def read_file_columns(datapoints_shp):
     return options
 
 
-def point_dataset_preprocess(point_dataset, options):
-
+def point_dataset_preprocess(point_dataset, options, rows=None):
+    """
+    :param rows: 只读取这些要素（slice），用于分批处理，默认为全部
+    """
     # 读取数据
-    gdf = gpd.read_file(point_dataset).to_crs(epsg=Drawing_specifications.EPSG_code)
+    gdf = gpd.read_file(point_dataset, rows=rows).to_crs(
+        epsg=Drawing_specifications.EPSG_code
+    )
     # Key的类型为枚举类型，无法直接使用
     for key, value in options.items():
         if value in gdf.columns:
@@ -11,9 +11,10 @@ from shapely.ops import unary_union
 
 
 from utils import (
-    idw_interpolation,
-    kriging_interpolation,
-    scipy_interpolation,
+    progressive_interpolation,
+    recommend_interpolation_method,
+    GridSpec,
+    PROGRESSIVE_LEVELS,
 )
 
 
@@ -24,14 +25,29 @@ from .function_utils import (
     add_north_arrow,
     add_scalebar,
 )
-from .empirical_threshold_functions import mask_with_polygon
 
 matplotlib.use("QtAgg")
 
 # * PCA Method
 
 
-def return_PCA_results(point_dataset, options, outline_dataset):
+# PC1 插值窗口中可选的插值方法
+PC_INTERPOLATION_METHODS = ["Nearest", "Cubic", "IDW", "Kriging"]
+
+
+def return_PCA_results(
+    point_dataset,
+    options,
+    outline_dataset,
+    interpolation_params=None,
+    precompute_interpolation=True,
+    cross_validation=False,
+):
+    # interpolation_params: {method: kwargs}，如 {"Kriging": {"n_closest_points": 12}}
+    # precompute_interpolation 为 False 时不预先绘制插值图，由界面逐级渲染
+    # cross_validation 为 True 时同步执行留一法交叉验证并推荐插值方法；界面在后台线程中调用
+    # recommend_PC_interpolation，不阻塞主成分分析结果的显示
+    interpolation_params = dict(interpolation_params or {})
     gdf = point_dataset_preprocess(point_dataset=point_dataset, options=options)
     boundary_gdf = boundary_file_preprocess(outline_dataset)
     pca_results, pca_loadings, pca_var_ratio, pca_gdf = process_PCA(
@@ -42,12 +58,20 @@ def return_PCA_results(point_dataset, options, outline_dataset):
     PCA_loading_plot_fig = plot_PCA_loading_plot(pca_loadings, pca_var_ratio)
     PCA_Biplot_fig = plot_PCA_Biplot(pca_results, pca_loadings, pca_var_ratio)
     PC1_interpolation_figs = {}
-    interpolation_methods = ["Nearest", "Cubic", "IDW", "Kriging"]
+    recommended_method, cv_table = None, None
+    if cross_validation:
+        recommended_method, recommended_params, cv_table = recommend_PC_interpolation(
+            pca_gdf
+        )
+        if recommended_method is not None:
+            interpolation_params.setdefault(recommended_method, recommended_params)
+    interpolation_methods = PC_INTERPOLATION_METHODS if precompute_interpolation else []
     for interpolation_method in interpolation_methods:
         fig = plot_PC_interpolation(
             boundary_gdf=boundary_gdf,
             points_gdf=pca_gdf,
             interpolation_method=interpolation_method,
+            interpolation_params=interpolation_params.get(interpolation_method),
         )
         PC1_interpolation_figs[interpolation_method] = fig
     return {
@@ -58,9 +82,27 @@ def return_PCA_results(point_dataset, options, outline_dataset):
         "PCA_loading_plot_fig": PCA_loading_plot_fig,
         "PCA_Biplot_fig": PCA_Biplot_fig,
         "PC1_interpolation_figs": PC1_interpolation_figs,
+        "interpolation_params": interpolation_params,
+        "recommended_interpolation_method": recommended_method,
+        "interpolation_cv_table": cv_table,
     }
 
 
+def recommend_PC_interpolation(pca_gdf, column="PC1"):
+    """
+    留一法交叉验证，在 PC1 插值窗口可选的插值方法中推荐误差最小的方法及参数
+    :param pca_gdf: 主成分分析结果的 GeoDataFrame
+    :param column: 参与交叉验证的主成分列，默认为 "PC1"
+    :return: (方法, 参数字典, 交叉验证结果表)，没有可用的方法时方法为None
+    """
+    return recommend_interpolation_method(
+        pca_gdf.geometry.x,
+        pca_gdf.geometry.y,
+        pca_gdf[column].values,
+        methods=PC_INTERPOLATION_METHODS,
+    )
+
+
 def process_PCA(gdf, options):
     pca_columns = []
     for key, value in options.items():
@@ -294,51 +336,101 @@ def plot_PC_interpolation(
     interpolation_method,
     PC="PC1",
     dpi=150,
+    interpolation_params=None,
+    cell_size=None,
+    max_cells=None,
 ) -> Figure:
+    for fig in progressive_PC_interpolation(
+        boundary_gdf,
+        points_gdf,
+        interpolation_method,
+        PC=PC,
+        dpi=dpi,
+        interpolation_params=interpolation_params,
+        cell_size=cell_size,
+        max_cells=max_cells,
+        levels=1,
+    ):
+        pass
+    return fig
+
+
+def progressive_PC_interpolation(
+    boundary_gdf,
+    points_gdf,
+    interpolation_method,
+    PC="PC1",
+    dpi=150,
+    interpolation_params=None,
+    cell_size=None,
+    max_cells=None,
+    levels=PROGRESSIVE_LEVELS,
+):
+    """
+    由粗到细依次生成插值图，最后一张为目标分辨率
+    网格格点数由网格单元边长（米）决定，默认值见 GridSpec.from_cell_size
+    """
     # Extract interpolated point coordinates
     x = points_gdf.geometry.x
     y = points_gdf.geometry.y
     z = points_gdf[PC].values
-    # Create a mesh
-    grid_x, grid_y = np.mgrid[
-        min(x) - 0.001 : max(x) + 0.001 : 100j, min(y) - 0.001 : max(y) + 0.001 : 100j
-    ]
-
+    grid = GridSpec.from_cell_size(
+        (min(x), min(y), max(x), max(y)), cell_size, max_cells
+    )
+    default_params = {
+        "IDW": {"power": 2},
+        "Kriging": {"variogram_model": "spherical"},
+    }
+    params = {
+        **default_params.get(interpolation_method, {}),
+        **(interpolation_params or {}),
+    }
     # Merging boundary polygons
     boundary_polygon = unary_union(boundary_gdf.geometry)
+    # 网格按分块在多进程中插值，相同输入直接读取磁盘缓存；只插值边界内的格点
+    for grid_x, grid_y, masked_z in progressive_interpolation(
+        interpolation_method,
+        x,
+        y,
+        z,
+        grid,
+        levels,
+        boundary=boundary_polygon,
+        crs=boundary_gdf.crs,
+        **params,
+    ):
+        yield _plot_PC_surface(
+            boundary_gdf,
+            points_gdf,
+            grid_x,
+            grid_y,
+            masked_z,
+            interpolation_method,
+            PC=PC,
+            dpi=dpi,
+        )
+
+
+def _plot_PC_surface(
+    boundary_gdf,
+    points_gdf,
+    grid_x,
+    grid_y,
+    masked_z,
+    interpolation_method,
+    PC="PC1",
+    dpi=150,
+) -> Figure:
+    z = points_gdf[PC].values
     fig = Figure(figsize=(8, 6), dpi=dpi)
     ax = fig.add_subplot(111, aspect="equal")
     # 绘图配置
     cmap = plt.cm.RdBu_r  # 红到蓝渐变色标
     levels = np.linspace(np.nanmin(z), np.nanmax(z), 20)
-    if interpolation_method == "Nearest":
-        from scipy.interpolate import griddata
-
-        grid_z = griddata((x, y), z, (grid_x, grid_y), method="nearest")
-        masked_z = mask_with_polygon(grid_x, grid_y, grid_z, boundary_polygon)
-        contour = ax.contourf(grid_x, grid_y, masked_z, cmap=cmap, levels=levels)
-    elif interpolation_method == "Cubic":
-        from scipy.interpolate import griddata
-
-        grid_z = griddata((x, y), z, (grid_x, grid_y), method="cubic")
-        masked_z = mask_with_polygon(grid_x, grid_y, grid_z, boundary_polygon)
-        contour = ax.contourf(grid_x, grid_y, masked_z, cmap=cmap, levels=levels)
-    elif interpolation_method == "IDW":
-        grid_z = idw_interpolation(x, y, z, grid_x, grid_y, power=2)
-        masked_z = mask_with_polygon(grid_x, grid_y, grid_z, boundary_polygon)
-        contour = ax.contourf(grid_x, grid_y, masked_z, cmap=cmap, levels=levels)
-
-    elif interpolation_method == "Kriging":
-        grid_z = kriging_interpolation(
-            x,
-            y,
-            z,
-            np.linspace(min(x) - 0.001, max(x) + 0.001, 100),
-            np.linspace(min(y) - 0.001, max(y) + 0.001, 100),
-            variogram_model="spherical",
-        )
-        masked_z = mask_with_polygon(grid_x, grid_y, grid_z, boundary_polygon)
+    if interpolation_method == "Kriging":
         contour = ax.contourf(grid_x, grid_y, masked_z, cmap=cmap, extend="neither")
+    else:
+        contour = ax.contourf(grid_x, grid_y, masked_z, cmap=cmap, levels=levels)
     add_common_elements(ax, boundary_gdf, points_gdf)
 
     # * Customize the colorbar
@@ -15,6 +15,9 @@ from core import (
     point_dataset_preprocess,
     process_background_value_method,
     calculate_backgroundLevel,
+    anomaly_flags_to_glyphs,
+    ANOMALY_RULES,
+    ANOMALY_GLYPHS,
     export_to_vector_file,
     export_to_word,
     export_to_table,
@@ -332,7 +335,11 @@ class function_win(QWidget):
         ]
         # 创建表格视图
         self.table_view = QTableView()
-        self.table_model = GeoDataFrameModel(self.gdf, header)
+        self.table_model = GeoDataFrameModel(
+            self.gdf,
+            header,
+            formatters={column: ANOMALY_GLYPHS.get for column, _, _ in ANOMALY_RULES},
+        )
         self.table_view.setModel(self.table_model)
         self.table_view.resizeColumnsToContents()
         self.table_view.resizeRowsToContents()
@@ -359,10 +366,10 @@ class function_win(QWidget):
         center_window(self)
 
     def export_to_excel(self):
-        export_to_table(self.gdf, self)  # type: ignore
+        export_to_table(anomaly_flags_to_glyphs(self.gdf), self)  # type: ignore
 
     def export_to_gpkg(self):
-        export_to_vector_file(self.gdf, self)  # type: ignore
+        export_to_vector_file(anomaly_flags_to_glyphs(self.gdf), self)  # type: ignore
 
     def plot_data(self):
         from utils.pyside6_utils import show_multiple_plots
@@ -379,11 +386,15 @@ class function_win(QWidget):
 
 
 class GeoDataFrameModel(QAbstractTableModel):
-    def __init__(self, gdf, columns_to_display):
+    def __init__(self, gdf, columns_to_display, formatters=None):
+        """
+        :param formatters: 各列的显示转换函数 {列名: 函数}，如把判别结果转换为符号
+        """
         super().__init__()
 
         self._gdf = gdf
         self._columns_to_display = columns_to_display
+        self._formatters = formatters or {}
 
     def rowCount(self, parent=None):
         return len(self._gdf)
@@ -394,7 +405,10 @@ class GeoDataFrameModel(QAbstractTableModel):
     def data(self, index, role=Qt.DisplayRole):  # type: ignore
         if role == Qt.DisplayRole:
             column_name = self._columns_to_display[index.column()]
-            return str(self._gdf.iloc[index.row()][column_name])
+            value = self._gdf.iloc[index.row()][column_name]
+            if column_name in self._formatters:
+                value = self._formatters[column_name](value)
+            return str(value)
         return None
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
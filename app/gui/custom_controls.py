@@ -4,6 +4,7 @@ from PySide6.QtCore import (
     QAbstractTableModel,
     Signal,
     QPoint,
+    QThread,
 )
 from PySide6.QtGui import QFont, QIcon
 from PySide6.QtWidgets import (
@@ -402,3 +403,39 @@ class PlotWindow(QWidget):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
         center_window(self)
+
+    def set_figure(self, fig):
+        """替换当前显示的图表（用于逐级加密的预览）"""
+        old_canvas, old_toolbar = self.canvas, self.toolbar
+        self.fig = fig
+        self.fig.set_size_inches(4, 3)
+        self.canvas = FigureCanvas(self.fig)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        self.layout().replaceWidget(old_toolbar, self.toolbar)
+        self.layout().replaceWidget(old_canvas, self.canvas)
+        old_toolbar.deleteLater()
+        old_canvas.deleteLater()
+
+
+class progressive_plot_worker(QThread):
+    """在后台线程中迭代逐级加密的绘图生成器，每完成一级发送一次图表"""
+
+    level_ready = Signal(object)
+    error_occurred = Signal(str)
+    finished_signal = Signal()
+
+    def __init__(self, figure_generator, *args, **kwargs):
+        super().__init__()
+        self.figure_generator = figure_generator
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            for fig in self.figure_generator(*self.args, **self.kwargs):
+                if self.isInterruptionRequested():
+                    break
+                self.level_ready.emit(fig)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+        self.finished_signal.emit()
@@ -12,6 +12,7 @@ from PySide6.QtWidgets import (
 
 from core import (
     calculate_ExperienceValueMethod_scores,
+    progressive_Score_interpolation,
     plot_basic_info,
     read_file_columns,
     export_to_word,
@@ -26,6 +27,7 @@ from utils import (
     Secondary_Functions_of_ETA,
     center_window,
     show_multiple_plots,
+    keep_window_alive,
 )
 from report_templates import auto_report_for_empirical_threshold_analysis
 from .custom_controls import (
@@ -36,6 +38,8 @@ from .custom_controls import (
     GeoDataFrameModel,
     bottom_buttons,
     LoadingWindow,
+    PlotWindow,
+    progressive_plot_worker,
 )
 
 
@@ -50,8 +54,12 @@ class worker(QThread):
         self.outline_dataset = outline_dataset
 
     def run(self):
+        # 污染程度插值图在结果窗口中逐级渲染
         result_dict = calculate_ExperienceValueMethod_scores(
-            self.point_dataset, self.options, self.outline_dataset
+            self.point_dataset,
+            self.options,
+            self.outline_dataset,
+            include_pollution_level_fig=False,
         )
         self.result_ready.emit(result_dict)
         self.finished_signal.emit()
@@ -169,6 +177,9 @@ class Contamination_identification_win(QWidget):
         super().__init__()
         self.result_dict = result_dict
         self.result_gdf = result_dict["gdf"]
+        self.PLI_worker = None
+        self.PLI_win = None
+        self.PLI_latest_fig = None
         self.initUI()
 
     def initUI(self):
@@ -254,7 +265,49 @@ class Contamination_identification_win(QWidget):
         self.result_win4.show()
 
     def function_PLI(self):
-        show_multiple_plots(self.result_dict.get("pollution_level_fig"))
+        if self.result_dict.get("pollution_level_fig") is not None:
+            show_multiple_plots(self.result_dict.get("pollution_level_fig"))
+            return
+        if self.PLI_worker is not None:
+            return
+        # 先显示粗网格结果，后台逐级加密
+        self.PLI_worker = progressive_plot_worker(
+            progressive_Score_interpolation,
+            self.result_gdf,
+            self.result_dict["outline_dataset"],
+        )
+        self.PLI_worker.level_ready.connect(self.on_PLI_level_ready)
+        self.PLI_worker.error_occurred.connect(self.on_PLI_error)
+        self.PLI_worker.finished_signal.connect(self.on_PLI_finished)
+        self.PLI_worker.start()
+
+    @Slot(object)
+    def on_PLI_level_ready(self, fig):
+        from copy import deepcopy
+
+        self.PLI_latest_fig = fig
+        if self.PLI_win is None:
+            # 窗口无父对象，由 app.windows 持有引用；关闭后再次运行时重新创建
+            self.PLI_win = keep_window_alive(PlotWindow(deepcopy(fig)))
+            self.PLI_win.destroyed.connect(self.on_PLI_window_destroyed)
+            self.PLI_win.show()
+        else:
+            self.PLI_win.set_figure(deepcopy(fig))
+
+    @Slot(str)
+    def on_PLI_error(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to plot data: {message}")
+
+    @Slot()
+    def on_PLI_finished(self):
+        if self.PLI_latest_fig is not None:
+            self.result_dict["pollution_level_fig"] = self.PLI_latest_fig
+        self.PLI_worker.deleteLater()
+        self.PLI_worker = None
+
+    @Slot()
+    def on_PLI_window_destroyed(self):
+        self.PLI_win = None
 
     def auto_report(self):
 
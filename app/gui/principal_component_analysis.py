@@ -1,9 +1,11 @@
+import logging
 from PySide6.QtCore import Signal, QThread, Slot
 from PySide6.QtWidgets import (
     QMessageBox,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
+    QLabel,
 )
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
@@ -13,10 +15,13 @@ from .custom_controls import (
     Interpolation_method_selection,
     LoadingWindow,
     WrapButton,
+    progressive_plot_worker,
 )
 from utils import center_window, show_multiple_plots, AppStyle, Software_info
 from core import (
     return_PCA_results,
+    recommend_PC_interpolation,
+    progressive_PC_interpolation,
     export_to_word,
     export_to_table,
     export_to_vector_file,
@@ -36,15 +41,34 @@ class PCA_worker(QThread):
     def run(self):
         # 执行PCA分析
         # 返回绘图对象结果
+        # 插值图在 PC1_Interpolation 窗口中逐级渲染
         result_dict = return_PCA_results(
             point_dataset=self.point_dataset,
             options=self.options,
             outline_dataset=self.outline_dataset,
+            precompute_interpolation=False,
         )
         self.result_ready.emit(result_dict)
         self.finished_signal.emit()
 
 
+class interpolation_CV_worker(QThread):
+    """在后台线程中对 PC1 做留一法交叉验证，推荐插值方法"""
+
+    result_ready = Signal(object, object, object)
+    error_occurred = Signal(str)
+
+    def __init__(self, pca_gdf):
+        super().__init__()
+        self.pca_gdf = pca_gdf
+
+    def run(self):
+        try:
+            self.result_ready.emit(*recommend_PC_interpolation(self.pca_gdf))
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+
 class Attribute_Window_PCA(Attribute_Window):
 
     def __init__(self, point_dataset, outline_dataset, method):
@@ -123,8 +147,11 @@ class PCA_function_win(QWidget):
         show_multiple_plots([self.result_dict["PC1_score_fig"]])
 
     def display_PC1_interpolation(self):
-        self.PC1_interpolation_win = PC1_Interpolation(self.result_dict)
+        # 复用已打开的窗口，避免后台插值线程随旧窗口一起被销毁
+        if getattr(self, "PC1_interpolation_win", None) is None:
+            self.PC1_interpolation_win = PC1_Interpolation(self.result_dict)
         self.PC1_interpolation_win.show()
+        self.PC1_interpolation_win.raise_()
 
     def export_gdf(self):
         export_to_vector_file(self.result_dict.get("gdf"), self)
@@ -135,6 +162,11 @@ class PC1_Interpolation(QWidget):
         super().__init__()
         self.result_dict = result_dict
         self.current_canvas = None
+        self.current_method = None
+        self.workers = {}
+        self.latest_figs = {}
+        self.cv_worker = None
+        self.method_selected = False
         self.initUI()
 
     def initUI(self):
@@ -145,15 +177,24 @@ class PC1_Interpolation(QWidget):
         self.dynamic_layout = QVBoxLayout()
         self.create_initial_plot()
         bottom_layout = QHBoxLayout()
+        self.recommendation_label = QLabel()
+        bottom_layout.addWidget(self.recommendation_label)
         bottom_layout.addStretch(1)
 
         self.interpolation_method = Interpolation_method_selection()
+        recommended_method = self.result_dict.get("recommended_interpolation_method")
+        if recommended_method is not None:
+            self.interpolation_method.combobox.setCurrentText(recommended_method)
         bottom_layout.addWidget(self.interpolation_method)
         self.main_layout.addLayout(self.dynamic_layout)
         self.main_layout.addLayout(bottom_layout)
         self.setLayout(self.main_layout)
 
         self.interpolation_method.Interpolation_method.connect(self.update_plot)
+        if self.result_dict.get("interpolation_cv_table") is None:
+            self.start_cross_validation()
+        else:
+            self.show_recommendation()
 
         # 窗口属性
         self.setWindowTitle("PC1 Interpolation Plot")
@@ -162,11 +203,56 @@ class PC1_Interpolation(QWidget):
         center_window(self)
 
     def update_canvas(self, method):
-        """根据方法名更新画布和工具栏"""
+        """根据方法名更新画布和工具栏；尚未计算的方法在后台由粗到细逐级渲染"""
+        self.current_method = method
+        figs = self.result_dict["PC1_interpolation_figs"]
+        if method in figs:
+            self.show_figure(figs[method])
+            return
+        if method in self.workers:
+            return
+        worker = progressive_plot_worker(
+            progressive_PC_interpolation,
+            boundary_gdf=self.result_dict["boundary_gdf"],
+            points_gdf=self.result_dict["gdf"],
+            interpolation_method=method,
+            interpolation_params=self.result_dict.get("interpolation_params", {}).get(
+                method
+            ),
+        )
+        worker.level_ready.connect(self.on_level_ready)
+        worker.error_occurred.connect(self.on_worker_error)
+        worker.finished_signal.connect(self.on_worker_finished)
+        self.workers[method] = worker
+        worker.start()
+
+    @Slot(object)
+    def on_level_ready(self, fig):
+        method = self.sender().kwargs["interpolation_method"]
+        self.latest_figs[method] = fig
+        # 已切换到其他方法时只保存结果，不刷新画布
+        if method == self.current_method:
+            self.show_figure(fig)
+
+    @Slot(str)
+    def on_worker_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+    @Slot()
+    def on_worker_finished(self):
+        worker = self.sender()
+        method = worker.kwargs["interpolation_method"]
+        if method in self.latest_figs:
+            self.result_dict["PC1_interpolation_figs"][method] = self.latest_figs.pop(
+                method
+            )
+        self.workers.pop(method, None)
+        worker.deleteLater()
+
+    def show_figure(self, fig):
         try:
             from copy import deepcopy
 
-            fig = self.result_dict["PC1_interpolation_figs"][method]
             fig = deepcopy(fig)
             # 清理旧组件
             if self.current_canvas:
@@ -184,15 +270,69 @@ class PC1_Interpolation(QWidget):
             self.dynamic_layout.addWidget(self.toolbar)
             self.dynamic_layout.addWidget(self.current_canvas)
 
-        except KeyError:
-            raise ValueError(f"Method '{method}' not found in results")
         except Exception as e:
             raise RuntimeError(f"Failed to update plot: {str(e)}")
 
+    def closeEvent(self, event):
+        # 等待正在计算的级别完成，防止线程在运行中被销毁
+        for worker in list(self.workers.values()):
+            worker.requestInterruption()
+            worker.wait()
+        if self.cv_worker is not None:
+            self.cv_worker.wait()
+        super().closeEvent(event)
+
+    def start_cross_validation(self):
+        # 交叉验证在后台进行，先显示默认方法的插值图
+        self.recommendation_label.setText(
+            self.tr("Recommended (leave-one-out RMSE):") + " ..."
+        )
+        self.cv_worker = interpolation_CV_worker(self.result_dict["gdf"])
+        self.cv_worker.result_ready.connect(self.on_cv_result_ready)
+        self.cv_worker.error_occurred.connect(self.on_cv_error)
+        self.cv_worker.finished.connect(self.cv_worker.deleteLater)
+        self.cv_worker.start()
+
+    @Slot(object, object, object)
+    def on_cv_result_ready(self, method, params, cv_table):
+        self.cv_worker = None
+        self.result_dict["recommended_interpolation_method"] = method
+        self.result_dict["interpolation_cv_table"] = cv_table
+        if method is not None:
+            self.result_dict.setdefault("interpolation_params", {}).setdefault(
+                method, params
+            )
+        self.show_recommendation()
+        # 用户尚未手动选择方法时切换到推荐的方法
+        if method is not None and not self.method_selected:
+            self.interpolation_method.combobox.setCurrentText(method)
+
+    @Slot(str)
+    def on_cv_error(self, message):
+        self.cv_worker = None
+        self.recommendation_label.clear()
+        logging.warning(f"Cross-validation of PC1 interpolation failed: {message}")
+
+    def show_recommendation(self):
+        recommended_method = self.result_dict.get("recommended_interpolation_method")
+        if recommended_method is None:
+            self.recommendation_label.clear()
+            return
+        cv_table = self.result_dict["interpolation_cv_table"]
+        rmse = cv_table.loc[cv_table["method"] == recommended_method, "RMSE"].min()
+        self.recommendation_label.setText(
+            self.tr("Recommended (leave-one-out RMSE):")
+            + f" {recommended_method} ({rmse:.4g})"
+        )
+
     def create_initial_plot(self):
-        self.update_canvas("Nearest")
+        # 默认显示交叉验证推荐的插值方法
+        self.update_canvas(
+            self.result_dict.get("recommended_interpolation_method") or "Nearest"
+        )
 
     def update_plot(self, method):
+        self.method_selected = True
         try:
             self.update_canvas(method)
         except Exception as e:
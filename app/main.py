@@ -114,8 +114,36 @@ class start_window(QWidget):
 
 if __name__ == "__main__":
     import os
+    from multiprocessing import freeze_support
+    from utils import (
+        grid_utils,
+        interpolation_scheduler,
+        progressive_utils,
+        surface_cache,
+        surface_store,
+    )
 
+    # 打包后的程序启动插值进程池时需要
+    freeze_support()
     settings = load_settings()
+    interpolation_workers = settings.get("INTERPOLATION_WORKERS")
+    if interpolation_workers:
+        interpolation_scheduler.INTERPOLATION_WORKERS = int(interpolation_workers)
+    surface_cache_mb = settings.get("SURFACE_CACHE_MB")
+    if surface_cache_mb:
+        surface_cache.max_mb = float(surface_cache_mb)
+    surface_precision = settings.get("SURFACE_PRECISION")
+    if surface_precision in ("float32", "float64"):
+        progressive_utils.SURFACE_PRECISION = surface_precision
+    grid_cell_size = settings.get("GRID_CELL_SIZE")
+    if grid_cell_size:
+        grid_utils.GRID_CELL_SIZE = float(grid_cell_size)
+    grid_max_cells = settings.get("GRID_MAX_CELLS")
+    if grid_max_cells:
+        grid_utils.GRID_MAX_CELLS = int(grid_max_cells)
+    surface_store_min_cells = settings.get("SURFACE_STORE_MIN_CELLS")
+    if surface_store_min_cells:
+        surface_store.SURFACE_STORE_MIN_CELLS = int(surface_store_min_cells)
     # Scaling issues can be solved by setting the value of QT_SCALE_FACTOR
     qt_scale_factor = settings.get("QT_SCALE_FACTOR", "1.00")
     os.environ["QT_SCALE_FACTOR"] = qt_scale_factor
@@ -11,12 +11,47 @@ from .pyside6_utils import (
     load_settings,
     traverse_layout,
     show_multiple_plots,
+    keep_window_alive,
     update_config_value,
 )
 from .interpolation_utils import (
     kriging_interpolation,
+    local_kriging,
+    global_kriging,
     scipy_interpolation,
     idw_interpolation,
+    interpolate,
+    batch_interpolate,
+    INTERPOLATION_METHODS,
+)
+from .cross_validation_utils import (
+    loo_predictions,
+    cross_validate,
+    recommend_interpolation_method,
+    CV_CANDIDATES,
+    CV_KRIGING_MAX_POINTS,
+    APPROXIMATE_LOO_METHODS,
+)
+from .triangulation_utils import TriangulationInterpolator, get_triangulation
+from .interpolation_scheduler import parallel_interpolation
+from .surface_cache import SurfaceCache, surface_cache, cached_interpolation
+from .mask_utils import polygon_mask, boundary_mask, scanline_mask
+from .grid_utils import GridSpec
+from .score_table_utils import ScoreTable, compile_score_config, load_score_config
+from .unit_utils import normalize_units, unit_conversion
+from .natural_breaks_utils import two_class_boundary, natural_breaks
+from .surface_store import SurfaceStore, interpolate_to_store
+from .progressive_utils import (
+    progressive_interpolation,
+    progressive_grids,
+    PROGRESSIVE_LEVELS,
+)
+from .variogram_utils import (
+    VariogramModel,
+    VariogramCache,
+    variogram_cache,
+    get_variogram_model,
+    variogram_parameters_dict,
 )
 from .auto_report_EN import (
     save_docx_safely,
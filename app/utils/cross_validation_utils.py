@@ -0,0 +1,275 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import Delaunay, cKDTree
+from scipy.spatial import QhullError
+import scipy.interpolate as spi
+
+from .interpolation_utils import (
+    CHUNK_ELEMENTS,
+    _idw_weights,
+    _kriging_matrix,
+    _variogram_fit_index,
+    local_kriging,
+)
+from .triangulation_utils import get_triangulation
+from .variogram_utils import get_variogram_model
+
+# 默认参与交叉验证的插值方法及参数
+CV_CANDIDATES = (
+    ("Nearest", {}),
+    ("Linear", {}),
+    ("Cubic", {}),
+    ("IDW", {"power": 1}),
+    ("IDW", {"power": 2}),
+    ("IDW", {"power": 3}),
+    ("Kriging", {"variogram_model": "spherical"}),
+    ("Kriging", {"variogram_model": "exponential"}),
+)
+
+# 留一预测值为近似值的方法（小写）：只列在交叉验证结果表中，不参与推荐
+APPROXIMATE_LOO_METHODS = ("cubic",)
+
+# 全局克里金留一法需要对 (n+1)×(n+1) 的矩阵求逆（O(n²)内存、O(n³)时间），
+# 数据点超过该数量时改用局部克里金评估
+CV_KRIGING_MAX_POINTS = 1500
+
+# 改用局部克里金评估时使用的邻近点数量
+CV_KRIGING_NEIGHBORS = 16
+
+
+def loo_predictions(method, x, y, z, **params):
+    """
+    留一法（leave-one-out）交叉验证的预测值：第 i 个值为去掉第 i 个数据点后在该点的插值结果
+    各方法均不逐点重新插值：
+    - Nearest：取除自身外最近的数据点
+    - Linear：删除一个点只影响其相邻三角形，在相邻点的局部三角剖分上插值（与重新剖分一致）
+    - Cubic：在两层相邻点上局部重建 Clough-Tocher 插值（近似，见 APPROXIMATE_LOO_METHODS）
+    - IDW：距离权重矩阵的对角线置零
+    - Kriging：全局普通克里金的留一恒等式 e_i = (A⁻¹b)_i / (A⁻¹)_ii，只需一次矩阵求逆；
+      指定 n_closest_points 或数据点超过 CV_KRIGING_MAX_POINTS 时用局部克里金批量求解（排除自身）
+    凸包顶点在 Linear/Cubic 下无法插值，返回NaN；与其他数据点重合的点返回重合点的值
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param params: 对应插值方法的参数（与 interpolate 一致）
+    :return: 各数据点的留一预测值
+    """
+    points = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+    z = np.asarray(z, dtype=float)
+    name = method.lower()
+    if name == "nearest":
+        return _loo_nearest(points, z)
+    if name == "linear":
+        return _loo_triangulation(points, z, rings=1)
+    if name == "cubic":
+        return _loo_triangulation(points, z, rings=2)
+    if name == "idw":
+        return _loo_idw(points, z, **params)
+    if name == "kriging":
+        return _loo_kriging(points, z, **params)
+    raise ValueError(f"Unsupported interpolation method: {method}")
+
+
+def _loo_nearest(points, z):
+    _, idx = cKDTree(points).query(points, k=2)
+    own = np.arange(len(points))
+    return z[np.where(idx[:, 0] == own, idx[:, 1], idx[:, 0])]
+
+
+def _loo_triangulation(points, z, rings):
+    tri = get_triangulation(points[:, 0], points[:, 1]).tri
+    indptr, indices = tri.vertex_neighbor_vertices
+    hull = np.zeros(len(points), dtype=bool)
+    hull[tri.convex_hull.ravel()] = True
+    predictions = np.full(len(points), np.nan)
+    # 重合的数据点只有一个进入三角剖分，其余被 Qhull 记为 coplanar（没有相邻点）；
+    # 删除其中一个后另一个仍在原位置，留一预测值即为重合点的值
+    if len(tri.coplanar):
+        dropped, kept = tri.coplanar[:, 0], tri.coplanar[:, 2]
+        same = np.all(points[dropped] == points[kept], axis=1)
+        predictions[dropped[same]] = z[kept[same]]
+        predictions[kept[same]] = z[dropped[same]]
+    for i in np.flatnonzero(~hull & np.isnan(predictions)):
+        neighbors = indices[indptr[i] : indptr[i + 1]]
+        if neighbors.size == 0:
+            # 未进入三角剖分的退化点，保持NaN
+            continue
+        for _ in range(rings - 1):
+            neighbors = np.unique(
+                np.concatenate([indices[indptr[j] : indptr[j + 1]] for j in neighbors])
+            )
+            neighbors = neighbors[neighbors != i]
+        try:
+            if rings == 1:
+                local = Delaunay(points[neighbors])
+                simplex = local.find_simplex(points[i])
+                if simplex < 0:
+                    continue
+                transform = local.transform[simplex]
+                bary = transform[:2] @ (points[i] - transform[2])
+                bary = np.append(bary, 1 - bary.sum())
+                predictions[i] = bary @ z[neighbors[local.simplices[simplex]]]
+            else:
+                predictions[i] = spi.CloughTocher2DInterpolator(
+                    points[neighbors], z[neighbors]
+                )(points[i])[0]
+        except (QhullError, ValueError):
+            # 相邻点共线等退化情况，只跳过该点
+            continue
+    return predictions
+
+
+def _loo_idw(
+    points,
+    z,
+    power=2,
+    n_neighbors=None,
+    search_radius=None,
+    chunk_elements=CHUNK_ELEMENTS,
+):
+    n = len(points)
+    predictions = np.empty(n)
+    if n_neighbors is None and search_radius is None:
+        chunk = max(1, chunk_elements // max(n, 1))
+        for start in range(0, n, chunk):
+            block = points[start : start + chunk]
+            dist = np.sqrt(
+                (points[:, 0] - block[:, [0]]) ** 2
+                + (points[:, 1] - block[:, [1]]) ** 2
+            )
+            weights = _idw_weights(dist, power)
+            rows = np.arange(len(block))
+            weights[rows, start + rows] = 0.0  # 去掉自身
+            predictions[start : start + chunk] = (weights @ z) / weights.sum(axis=1)
+        return predictions
+
+    tree = cKDTree(points)
+    own = np.arange(n)
+    if n_neighbors is not None:
+        upper_bound = np.inf if search_radius is None else search_radius
+        k = min(int(n_neighbors) + 1, n)
+        dist, idx = tree.query(points, k=k, distance_upper_bound=upper_bound)
+        dist = dist.reshape(n, k)
+        idx = idx.reshape(n, k)
+        keep = np.isfinite(dist) & (idx != own[:, None])
+        # 自身未出现在结果中时（重合点较多）只保留前 n_neighbors 个邻居
+        keep &= np.cumsum(keep, axis=1) <= int(n_neighbors)
+        weights = np.where(keep, _idw_weights(np.where(keep, dist, 1.0), power), 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sum(weights * z[np.where(keep, idx, 0)], axis=1) / np.sum(
+                weights, axis=1
+            )
+
+    pairs = tree.sparse_distance_matrix(tree, search_radius, output_type="ndarray")
+    pairs = pairs[pairs["i"] != pairs["j"]]
+    weights = _idw_weights(pairs["v"].copy(), power)
+    numerator = np.bincount(pairs["i"], weights * z[pairs["j"]], n)
+    denominator = np.bincount(pairs["i"], weights, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return numerator / denominator
+
+
+def _loo_kriging(
+    points,
+    z,
+    variogram_model="spherical",
+    variogram_parameters=None,
+    nlag=6,
+    weight=False,
+    n_closest_points=None,
+    max_distance=None,
+    max_points=CV_KRIGING_MAX_POINTS,
+    **kwargs,
+):
+    n = len(points)
+    if n_closest_points is None and n > max_points:
+        n_closest_points = CV_KRIGING_NEIGHBORS
+    model = get_variogram_model(
+        points[:, 0],
+        points[:, 1],
+        z,
+        variogram_model=variogram_model,
+        variogram_parameters=variogram_parameters,
+        nlags=nlag,
+        weight=weight,
+        # 与 kriging_interpolation 一致，局部克里金只在（抽样后的）数据点上拟合变异函数
+        fit_index=None if n_closest_points is None else _variogram_fit_index(n),
+    )
+    if n_closest_points is not None:
+        return local_kriging(
+            points[:, 0],
+            points[:, 1],
+            z,
+            points[:, 0],
+            points[:, 1],
+            model,
+            n_closest_points,
+            max_distance,
+            exclude=np.arange(n),
+        )
+    a_inv = np.linalg.inv(_kriging_matrix(points, model))
+    residuals = (a_inv[:n, :n] @ z) / np.diag(a_inv)[:n]
+    return z - residuals
+
+
+def cross_validate(x, y, z, candidates=CV_CANDIDATES):
+    """
+    对各插值方法及参数进行留一法交叉验证
+    误差统计只使用所有方法都能给出预测值的数据点，保证各方法之间可比
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param candidates: (方法, 参数字典) 的序列，默认为 CV_CANDIDATES
+    :return: DataFrame，列为 method, params, RMSE, MAE, bias, n, exact，按RMSE升序排列；
+        exact 为 False 表示留一预测值为近似值，误差与其他方法不完全可比
+    """
+    z = np.asarray(z, dtype=float)
+    predictions = []
+    for method, params in candidates:
+        try:
+            predictions.append(loo_predictions(method, x, y, z, **params))
+        except (np.linalg.LinAlgError, ValueError):
+            # 变异函数拟合失败或矩阵奇异时该候选不参与比较
+            predictions.append(np.full(len(z), np.nan))
+    predictions = np.array(predictions)
+    available = np.isfinite(predictions).any(axis=1)
+    common = np.isfinite(z) & np.isfinite(predictions[available]).all(axis=0)
+
+    rows = []
+    for (method, params), prediction, usable in zip(candidates, predictions, available):
+        error = prediction[common] - z[common]
+        usable = usable and error.size > 0
+        rows.append(
+            {
+                "method": method,
+                "params": params,
+                "RMSE": np.sqrt(np.mean(error**2)) if usable else np.nan,
+                "MAE": np.mean(np.abs(error)) if usable else np.nan,
+                "bias": np.mean(error) if usable else np.nan,
+                "n": int(common.sum()) if usable else 0,
+                "exact": method.lower() not in APPROXIMATE_LOO_METHODS,
+            }
+        )
+    return pd.DataFrame(rows).sort_values("RMSE", kind="stable", ignore_index=True)
+
+
+def recommend_interpolation_method(x, y, z, candidates=CV_CANDIDATES, methods=None):
+    """
+    根据留一法交叉验证的RMSE推荐插值方法，留一预测值为近似值的方法（exact 为 False）不参与推荐
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param candidates: (方法, 参数字典) 的序列，默认为 CV_CANDIDATES
+    :param methods: 只在这些方法中推荐（如界面中可选的方法），默认为None（全部候选）
+    :return: (方法, 参数字典, 交叉验证结果表)
+    """
+    if methods is not None:
+        candidates = [
+            (method, params) for method, params in candidates if method in methods
+        ]
+    table = cross_validate(x, y, z, candidates)
+    best = table[table["exact"]].dropna(subset=["RMSE"])
+    if best.empty:
+        return None, {}, table
+    return best.iloc[0]["method"], dict(best.iloc[0]["params"]), table
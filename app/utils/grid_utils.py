@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+
+# 目标网格单元边长（米，坐标系为 Drawing_specifications.EPSG_code）与网格单元数上限
+# （可在 settings.txt 中通过 GRID_CELL_SIZE、GRID_MAX_CELLS 配置）
+GRID_CELL_SIZE = 2.0
+GRID_MAX_CELLS = 250000
+# 每个方向的最少格点数，避免很小的场地只有几个格点
+GRID_MIN_CELLS_PER_AXIS = 20
+
+
+class GridSpec:
+    """
+    规则插值网格：网格范围与两个方向的格点数，格点包含范围的边界
+    (与 np.mgrid[min_x:max_x:nx*1j, min_y:max_y:ny*1j] 一致）
+    """
+
+    def __init__(self, bounds, nx, ny):
+        """
+        :param bounds: 网格范围 (min_x, min_y, max_x, max_y)
+        :param nx: X方向的格点数
+        :param ny: Y方向的格点数
+        """
+        self.bounds = tuple(float(value) for value in bounds)
+        self.nx = int(nx)
+        self.ny = int(ny)
+
+    @classmethod
+    def from_cell_size(
+        cls,
+        bounds,
+        cell_size=None,
+        max_cells=None,
+        min_cells_per_axis=GRID_MIN_CELLS_PER_AXIS,
+    ):
+        """
+        由目标网格单元边长生成网格，格点数随场地面积变化；超过 max_cells 时按比例增大单元边长
+        :param bounds: 网格范围 (min_x, min_y, max_x, max_y)，坐标单位为米（投影坐标系）
+        :param cell_size: 网格单元边长（米），默认为 GRID_CELL_SIZE
+        :param max_cells: 网格单元数上限，默认为 GRID_MAX_CELLS
+        :param min_cells_per_axis: 每个方向的最少格点数，默认为 GRID_MIN_CELLS_PER_AXIS
+        :return: GridSpec
+        """
+        cell_size = float(cell_size or GRID_CELL_SIZE)
+        max_cells = int(max_cells or GRID_MAX_CELLS)
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        min_x, min_y, max_x, max_y = bounds
+        width = max(max_x - min_x, 0.0)
+        height = max(max_y - min_y, 0.0)
+
+        def axis_cells(length, size):
+            return max(min_cells_per_axis, math.ceil(length / size) + 1)
+
+        nx, ny = axis_cells(width, cell_size), axis_cells(height, cell_size)
+        while nx * ny > max_cells and (
+            nx > min_cells_per_axis or ny > min_cells_per_axis
+        ):
+            cell_size *= math.sqrt(nx * ny / max_cells) * 1.001
+            nx, ny = axis_cells(width, cell_size), axis_cells(height, cell_size)
+        return cls(bounds, nx, ny)
+
+    @property
+    def shape(self):
+        return self.nx, self.ny
+
+    @property
+    def size(self):
+        return self.nx * self.ny
+
+    @property
+    def cell_size(self):
+        """(X方向格点间距, Y方向格点间距)"""
+        min_x, min_y, max_x, max_y = self.bounds
+        return (
+            (max_x - min_x) / max(self.nx - 1, 1),
+            (max_y - min_y) / max(self.ny - 1, 1),
+        )
+
+    def axes(self):
+        """返回X、Y方向的一维坐标轴 (xs, ys)，与 mesh() 的行、列坐标一致"""
+        min_x, min_y, max_x, max_y = self.bounds
+        return (
+            np.mgrid[min_x : max_x : self.nx * 1j],
+            np.mgrid[min_y : max_y : self.ny * 1j],
+        )
+
+    def mesh(self, rows=slice(None)):
+        """
+        返回 (grid_x, grid_y)，形状为 (nx, ny)
+        :param rows: 只生成这些行（X方向）的坐标，用于分块计算，默认为全部
+        """
+        xs, ys = self.axes()
+        return np.meshgrid(xs[rows], ys, indexing="ij")
+
+    def coarsened(self, factor, min_cells_per_axis=1):
+        """返回每个方向格点数约为 1/factor 的同范围网格"""
+        return GridSpec(
+            self.bounds,
+            max(min(min_cells_per_axis, self.nx), self.nx // factor),
+            max(min(min_cells_per_axis, self.ny), self.ny // factor),
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, GridSpec) and (self.bounds, self.shape) == (
+            other.bounds,
+            other.shape,
+        )
+
+    def __hash__(self):
+        return hash((self.bounds, self.shape))
+
+    def __repr__(self):
+        return f"GridSpec(bounds={self.bounds}, nx={self.nx}, ny={self.ny})"
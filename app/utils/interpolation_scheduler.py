@@ -0,0 +1,189 @@
+import os
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .interpolation_utils import interpolate, _variogram_fit_index
+from .variogram_utils import get_variogram_model
+
+# 并行插值的进程数，None 表示使用全部CPU核心（可在 settings.txt 中通过 INTERPOLATION_WORKERS 配置）
+INTERPOLATION_WORKERS = None
+# 每个分块包含的网格单元数
+TILE_CELLS = 32768
+# 网格单元数小于该值（不足两个分块）时直接单进程计算（进程启动开销大于收益）；
+# 约为默认 GRID_MAX_CELLS（250000）的 1/4，达到上限的网格经边界掩膜后仍会并行计算
+PARALLEL_MIN_CELLS = 2 * TILE_CELLS
+
+_executor = None
+_executor_workers = None
+# 多个界面线程（如主成分插值窗口每种方法一个线程）共用同一进程池
+_executor_lock = threading.Lock()
+
+
+def _get_executor(n_workers):
+    """
+    返回按 n_workers 创建的共享进程池；只有进程数设置改变时才重建。
+    进程池在Qt工作线程中创建，Linux 上使用 forkserver（其他平台为 spawn）启动子进程，避免从多线程进程 fork；
+    调用方须持有 _executor_lock，并在释放锁之前提交全部任务
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != n_workers:
+        previous = _executor
+        context = multiprocessing.get_context(
+            "forkserver" if sys.platform.startswith("linux") else "spawn"
+        )
+        _executor = ProcessPoolExecutor(max_workers=n_workers, mp_context=context)
+        _executor_workers = n_workers
+        if previous is not None:
+            # 已提交的任务继续完成，之后子进程自行退出
+            previous.shutdown(wait=False)
+    return _executor
+
+
+def shutdown_executor():
+    """关闭后台插值进程池"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+        _executor_workers = None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _attach_shared_memory(name):
+    try:
+        # Python 3.13+：子进程只读取，不交由 resource_tracker 管理
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _interpolate_tile(shm_name, n_points, method, tile_x, tile_y, params):
+    shm = _attach_shared_memory(shm_name)
+    try:
+        x, y, z = np.ndarray((3, n_points), dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+    return interpolate(method, x, y, z, tile_x, tile_y, **params)
+
+
+def parallel_interpolation(
+    method,
+    x,
+    y,
+    z,
+    grid_x,
+    grid_y,
+    n_workers=None,
+    tile_cells=TILE_CELLS,
+    min_cells=PARALLEL_MIN_CELLS,
+    mask=None,
+    dtype=np.float64,
+    **params,
+):
+    """
+    将目标网格拆分为分块，在进程池中并行插值后拼接为完整结果
+    数据点通过共享内存传递给各进程；网格较小或只有一个进程时直接在当前进程计算
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param grid_x: 目标点的X坐标（任意形状）
+    :param grid_y: 目标点的Y坐标（与 grid_x 同形状）
+    :param n_workers: 进程数，默认为 INTERPOLATION_WORKERS
+    :param tile_cells: 每个分块的网格单元数，默认为 TILE_CELLS
+    :param min_cells: 启用并行的最小网格单元数，默认为 PARALLEL_MIN_CELLS
+    :param mask: 与 grid_x 同形状的布尔数组，只插值为True的格点，其余为NaN；默认为None（全部格点）
+    :param dtype: 插值结果的精度，默认为 np.float64；各分块内部仍以 float64 计算
+    :param params: 传递给对应插值函数的参数
+    :return: 与 grid_x 同形状的插值结果
+    """
+    grid_x = np.asarray(grid_x, dtype=float)
+    grid_y = np.asarray(grid_y, dtype=float)
+    if mask is not None:
+        # 只计算掩膜内的格点，再填回以NaN初始化的完整网格
+        mask = np.asarray(mask, dtype=bool)
+        grid_z = np.full(grid_x.shape, np.nan, dtype=dtype)
+        if mask.any():
+            grid_z[mask] = parallel_interpolation(
+                method,
+                x,
+                y,
+                z,
+                grid_x[mask],
+                grid_y[mask],
+                n_workers=n_workers,
+                tile_cells=tile_cells,
+                min_cells=min_cells,
+                dtype=dtype,
+                **params,
+            )
+        return grid_z
+
+    points = np.vstack(
+        (
+            np.asarray(x, dtype=np.float64),
+            np.asarray(y, dtype=np.float64),
+            np.asarray(z, dtype=np.float64),
+        )
+    )
+    if n_workers is None:
+        n_workers = INTERPOLATION_WORKERS or os.cpu_count() or 1
+    n_tiles = -(-grid_x.size // tile_cells)
+    if n_workers <= 1 or grid_x.size < min_cells or n_tiles <= 1:
+        grid_z = interpolate(method, *points, grid_x, grid_y, **params)
+        return np.asarray(grid_z).astype(dtype, copy=False)
+
+    if method.lower() == "kriging" and params.get("variogram_parameters") is None:
+        # 变异函数在主进程拟合一次，各分块直接使用拟合参数
+        model = get_variogram_model(
+            *points,
+            variogram_model=params.get("variogram_model", "spherical"),
+            nlags=params.get("nlag", 6),
+            weight=params.get("weight", False),
+            fit_index=(
+                None
+                if params.get("n_closest_points") is None
+                else _variogram_fit_index(points.shape[1])
+            ),
+        )
+        # 以字典形式传递拟合参数：列表会被 pykrige 按 [sill, range, nugget] 解释
+        params = {**params, "variogram_parameters": model.variogram_parameters}
+
+    flat_x = grid_x.ravel()
+    flat_y = grid_y.ravel()
+    shm = shared_memory.SharedMemory(create=True, size=points.nbytes)
+    try:
+        np.ndarray(points.shape, dtype=np.float64, buffer=shm.buf)[:] = points
+        futures = []
+        with _executor_lock:
+            executor = _get_executor(n_workers)
+            for start in range(0, flat_x.size, tile_cells):
+                stop = start + tile_cells
+                futures.append(
+                    (
+                        start,
+                        executor.submit(
+                            _interpolate_tile,
+                            shm.name,
+                            points.shape[1],
+                            method,
+                            flat_x[start:stop],
+                            flat_y[start:stop],
+                            params,
+                        ),
+                    )
+                )
+        grid_z = np.empty(flat_x.size, dtype=dtype)
+        for start, future in futures:
+            tile_z = np.asarray(future.result(), dtype=float)
+            grid_z[start : start + tile_z.size] = tile_z
+    finally:
+        shm.close()
+        shm.unlink()
+    return grid_z.reshape(grid_x.shape)
@@ -2,9 +2,21 @@ import numpy as np
 import geopandas as gpd
 import matplotlib.pyplot as plt
 from shapely.geometry import Point
-from pykrige.ok import OrdinaryKriging
 import scipy.interpolate as spi
 
+from .variogram_utils import get_variogram_model
+from .triangulation_utils import get_triangulation
+
+# 插值方法名称（不区分大小写）
+INTERPOLATION_METHODS = ("Nearest", "Linear", "Cubic", "IDW", "Kriging")
+
+# 单个分块内允许的最大数组元素数，用于限制分块计算的内存占用（约32MB）
+CHUNK_ELEMENTS = 2**22
+
+
+# 局部克里金拟合变异函数时使用的最大样本点数（变异函数拟合为O(n²)）
+VARIOGRAM_FIT_MAX_POINTS = 2000
+
 
 def kriging_interpolation(
     x,
@@ -16,9 +28,14 @@ def kriging_interpolation(
     variogram_parameters=None,
     nlag=6,
     weight=False,
+    n_closest_points=None,
+    max_distance=None,
+    style="grid",
 ):
     """
     使用 Ordinary Kriging 进行插值
+    指定 n_closest_points 时使用局部（移动窗口）克里金：每个格点只用最近的 n 个数据点求解小型方程组，
+    适用于数据点较多的场地
     :param x: 数据点的X坐标
     :param y: 数据点的Y坐标
     :param z: 数据点的值（对应的Z值）
@@ -28,10 +45,16 @@ def kriging_interpolation(
     :param variogram_parameters: 变异函数的参数，依据所选模型不同
     :param nlag: 半变异函数的平均区间数，默认为6
     :param weight: 是否加权处理小的滞后距离，默认为False
+    :param n_closest_points: 局部克里金使用的邻近点数量，默认为None（全局克里金）
+    :param max_distance: 局部克里金的最大搜索距离，默认为None（不限制）；范围内无数据点的格点返回NaN
+    :param style: "grid" 时 grid_x/grid_y 为一维坐标轴，返回 (len(grid_y), len(grid_x))；
+        "points" 时 grid_x/grid_y 为任意形状的坐标数组，返回同形状结果
     :return: 插值后的结果
     """
     # return np.zeros(grid_x.shape)  # 返回全零结果
-    OK = OrdinaryKriging(
+    x, y, z = (np.asarray(v, dtype=float) for v in (x, y, z))
+    # 变异函数按数据与参数缓存，重复插值（不同网格、重新打开窗口）时不再重新拟合
+    model = get_variogram_model(
         x,
         y,
         z,
@@ -39,50 +62,435 @@ def kriging_interpolation(
         variogram_parameters=variogram_parameters,
         nlags=nlag,
         weight=weight,
-        verbose=False,
-        enable_plotting=False,
+        # 局部克里金只在（抽样后的）数据点上拟合变异函数
+        fit_index=None if n_closest_points is None else _variogram_fit_index(len(z)),
     )
+    if style == "grid":
+        mesh_x, mesh_y = np.meshgrid(grid_x, grid_y)
+    else:
+        mesh_x, mesh_y = np.asarray(grid_x, dtype=float), np.asarray(
+            grid_y, dtype=float
+        )
+    if n_closest_points is not None:
+        grid_z = local_kriging(
+            x,
+            y,
+            z,
+            mesh_x.ravel(),
+            mesh_y.ravel(),
+            model,
+            n_closest_points,
+            max_distance,
+        )
+        return grid_z.reshape(mesh_x.shape)
+
+    if style != "grid":
+        grid_z, ss = model.execute("points", mesh_x.ravel(), mesh_y.ravel())
+        return np.asarray(grid_z).reshape(mesh_x.shape)
 
     # 执行插值，grid_x 和 grid_y 需要传入二维网格
-    grid_z_kriging, ss = OK.execute("grid", grid_x, grid_y)
+    grid_z_kriging, ss = model.execute("grid", grid_x, grid_y)
 
     return grid_z_kriging  # 返回插值结果
 
 
+def _variogram_fit_index(n, max_points=VARIOGRAM_FIT_MAX_POINTS):
+    if n <= max_points:
+        return None
+    # 固定随机种子，保证同一数据集每次拟合结果一致
+    return np.sort(np.random.default_rng(0).choice(n, max_points, replace=False))
+
+
+def local_kriging(
+    x,
+    y,
+    z,
+    target_x,
+    target_y,
+    variogram_function,
+    n_closest_points=12,
+    max_distance=None,
+    eps=1e-10,
+    chunk_elements=CHUNK_ELEMENTS,
+    exclude=None,
+):
+    """
+    局部（移动窗口）普通克里金：对每个目标点使用最近的 n 个数据点批量求解克里金方程组
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值，形状为 (n,) 或 (n, 变量数)，多列时共用同一组权重
+    :param target_x: 目标点的X坐标（一维）
+    :param target_y: 目标点的Y坐标（一维）
+    :param variogram_function: 已拟合的变异函数（如 VariogramModel），输入距离返回半方差
+    :param n_closest_points: 邻近点数量，默认为12
+    :param max_distance: 最大搜索距离，默认为None（不限制）
+    :param eps: 判定目标点与数据点重合的距离阈值
+    :param chunk_elements: 单个分块的最大元素数，默认为 CHUNK_ELEMENTS
+    :param exclude: 各目标点不参与求解的数据点序号（如留一法交叉验证时目标点自身），默认为None
+    :return: 目标点的插值结果，形状为 (目标点数,) 或 (目标点数, 变量数)
+    """
+    from scipy.spatial import cKDTree
+
+    points = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+    z = np.asarray(z, dtype=float)
+    targets = np.column_stack(
+        (np.asarray(target_x, dtype=float), np.asarray(target_y, dtype=float))
+    )
+    tree = cKDTree(points)
+    n_closest_points = min(int(n_closest_points), len(points))
+    # 排除数据点时多查询一个邻居，被排除的邻居按缺失处理
+    k = n_closest_points if exclude is None else min(n_closest_points + 1, len(points))
+    upper_bound = np.inf if max_distance is None else max_distance
+    result = np.full((len(targets),) + z.shape[1:], np.nan)
+    chunk = max(1, chunk_elements // (2 * (k + 1) ** 2))
+
+    for start in range(0, len(targets), chunk):
+        block = targets[start : start + chunk]
+        dist, idx = tree.query(block, k=k, distance_upper_bound=upper_bound)
+        dist = dist.reshape(len(block), k)
+        idx = idx.reshape(len(block), k)
+        found = np.isfinite(dist)
+        if exclude is not None:
+            found &= idx != np.asarray(exclude)[start : start + chunk, None]
+            found &= np.cumsum(found, axis=1) <= n_closest_points
+        idx = np.where(found, idx, 0)
+        neighbors = points[idx]
+
+        # 组装批量克里金矩阵（与 pykrige 的约定一致：对角线为0，最后一行/列为拉格朗日约束）
+        pair_dist = np.sqrt(
+            np.sum((neighbors[:, :, None, :] - neighbors[:, None, :, :]) ** 2, axis=-1)
+        )
+        a = np.zeros((len(block), k + 1, k + 1))
+        a[:, :k, :k] = -variogram_function(pair_dist)
+        a[:, np.arange(k), np.arange(k)] = 0.0
+        a[:, k, :k] = 1.0
+        a[:, :k, k] = 1.0
+        b = np.zeros((len(block), k + 1))
+        b[:, :k] = -variogram_function(np.where(found, dist, 0.0))
+        b[:, :k][dist <= eps] = 0.0  # 与数据点重合时返回该点的值
+        b[:, k] = 1.0
+
+        # 缺失的邻居（超出搜索距离或被排除）退化为单位方程，权重为0
+        missing = ~found
+        a[:, :k, :][missing] = 0.0
+        a[:, :, :k].transpose(0, 2, 1)[missing] = 0.0
+        rows, cols = np.nonzero(missing)
+        a[rows, cols, cols] = 1.0
+        b[:, :k][missing] = 0.0
+
+        # 没有任何邻居的目标点保持NaN
+        valid = found.any(axis=1)
+        if not valid.any():
+            continue
+        weights = np.linalg.solve(a[valid], b[valid][..., None])[..., 0]
+        result[start : start + len(block)][valid] = np.einsum(
+            "ij,ij...->i...", weights[:, :k], z[idx[valid]]
+        )
+
+    return result
+
+
 # 定义基于 scipy 的插值函数
-def scipy_interpolation(x, y, z, grid_x, grid_y, method="nearest"):
+def scipy_interpolation(x, y, z, grid_x, grid_y, method="nearest", **kwargs):
     """
-    使用 scipy 进行插值（最近邻、立方插值）
+    使用 scipy 进行插值（最近邻、线性、立方插值）
+    同一组数据点的三角剖分会被缓存，不同列（指标、主成分）或不同网格重复插值时不再重新剖分
     :param x: 数据点的X坐标
     :param y: 数据点的Y坐标
-    :param z: 数据点的值（对应的Z值）
+    :param z: 数据点的值（对应的Z值），可以是 (n, 变量数) 的二维数组
     :param grid_x: 插值网格的X坐标
     :param grid_y: 插值网格的Y坐标
     :param method: 插值方法，默认为 'nearest'
+    :param kwargs: 传递给 griddata 的其他参数（如 fill_value）
     :return: 插值后的结果
     """
-    return spi.griddata((x, y), z, (grid_x, grid_y), method=method)
+    if kwargs.get("rescale"):
+        # 坐标缩放需要重新剖分，无法共享三角剖分
+        return spi.griddata((x, y), z, (grid_x, grid_y), method=method, **kwargs)
+    return get_triangulation(x, y)(
+        z, grid_x, grid_y, method=method, fill_value=kwargs.get("fill_value", np.nan)
+    )
 
 
 # 定义IDW插值函数（反距离加权）
-def idw_interpolation(x, y, z, grid_x, grid_y, power=2):
+def idw_interpolation(
+    x,
+    y,
+    z,
+    grid_x,
+    grid_y,
+    power=2,
+    n_neighbors=None,
+    search_radius=None,
+    chunk_elements=CHUNK_ELEMENTS,
+):
     """
     使用反距离加权（IDW）进行插值
+    网格按内存上限分块进行向量化计算；指定 n_neighbors 或 search_radius 时借助KD树只使用邻近点，
+    两者均为 None 时使用全部数据点，结果与逐格点计算一致
     :param x: 数据点的X坐标
     :param y: 数据点的Y坐标
     :param z: 数据点的值（对应的Z值）
     :param grid_x: 插值网格的X坐标
     :param grid_y: 插值网格的Y坐标
     :param power: 权重幂次，默认为2
+    :param n_neighbors: 参与加权的最近邻点数量，默认为None（全部点）
+    :param search_radius: 搜索半径，半径内没有数据点的格点返回NaN，默认为None（不限制）
+    :param chunk_elements: 单个分块的最大元素数，默认为 CHUNK_ELEMENTS
     :return: 插值后的结果
     """
-    grid_z = np.zeros(grid_x.shape)
+    grid_x = np.asarray(grid_x, dtype=float)
+    grid_y = np.asarray(grid_y, dtype=float)
+    points = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+    z = np.asarray(z, dtype=float)
+    # 多列数值共用同一组距离与权重
+    values = z.reshape(len(z), -1)
+    targets = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+
+    if n_neighbors is None and search_radius is None:
+        grid_z = _idw_all_points(points, values, targets, power, chunk_elements)
+    else:
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(points)
+        if n_neighbors is not None:
+            grid_z = _idw_k_nearest(
+                tree, values, targets, power, n_neighbors, search_radius, chunk_elements
+            )
+        else:
+            grid_z = _idw_radius(
+                tree, values, targets, power, search_radius, chunk_elements
+            )
+
+    return grid_z.reshape(grid_x.shape + z.shape[1:])
+
+
+def _idw_weights(dist, power):
+    dist[dist == 0] = 1e-10  # 防止出现零距离
+    return 1 / dist**power  # 计算距离权重
+
+
+def _idw_all_points(points, values, targets, power, chunk_elements):
+    grid_z = np.empty((len(targets), values.shape[1]))
+    chunk = max(1, chunk_elements // max(len(points), 1))
+    for start in range(0, len(targets), chunk):
+        block = targets[start : start + chunk]
+        dist = np.sqrt(
+            (points[:, 0] - block[:, [0]]) ** 2 + (points[:, 1] - block[:, [1]]) ** 2
+        )
+        weights = _idw_weights(dist, power)
+        grid_z[start : start + chunk] = (weights @ values) / np.sum(
+            weights, axis=1, keepdims=True
+        )  # 加权平均
+    return grid_z
+
+
+def _idw_k_nearest(
+    tree, values, targets, power, n_neighbors, search_radius, chunk_elements
+):
+    k = min(int(n_neighbors), tree.n)
+    upper_bound = np.inf if search_radius is None else search_radius
+    grid_z = np.empty((len(targets), values.shape[1]))
+    chunk = max(1, chunk_elements // (k * values.shape[1]))
+    for start in range(0, len(targets), chunk):
+        block = targets[start : start + chunk]
+        dist, idx = tree.query(block, k=k, distance_upper_bound=upper_bound)
+        dist = dist.reshape(len(block), k)
+        idx = idx.reshape(len(block), k)
+        # 超出搜索半径的邻居距离为inf、索引为tree.n，权重置零
+        found = np.isfinite(dist)
+        weights = np.where(found, _idw_weights(np.where(found, dist, 1.0), power), 0.0)
+        neighbor_values = values[np.where(found, idx, 0)]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid_z[start : start + chunk] = np.einsum(
+                "ij,ijv->iv", weights, neighbor_values
+            ) / np.sum(weights, axis=1, keepdims=True)
+    return grid_z
+
 
-    for i in range(grid_x.shape[0]):
-        for j in range(grid_x.shape[1]):
-            dist = np.sqrt((x - grid_x[i, j]) ** 2 + (y - grid_y[i, j]) ** 2)
-            dist[dist == 0] = 1e-10  # 防止出现零距离
-            weights = 1 / dist**power  # 计算距离权重
-            grid_z[i, j] = np.sum(weights * z) / np.sum(weights)  # 加权平均
+def _idw_radius(tree, values, targets, power, search_radius, chunk_elements):
+    from scipy.spatial import cKDTree
+    from scipy.sparse import csr_matrix
 
+    grid_z = np.empty((len(targets), values.shape[1]))
+    chunk = max(1, chunk_elements // max(tree.n, 1))
+    for start in range(0, len(targets), chunk):
+        block = targets[start : start + chunk]
+        pairs = cKDTree(block).sparse_distance_matrix(
+            tree, search_radius, output_type="ndarray"
+        )
+        weights = csr_matrix(
+            (_idw_weights(pairs["v"].copy(), power), (pairs["i"], pairs["j"])),
+            shape=(len(block), tree.n),
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid_z[start : start + chunk] = (weights @ values) / np.asarray(
+                weights.sum(axis=1)
+            )
     return grid_z
+
+
+def global_kriging(
+    x,
+    y,
+    z,
+    target_x,
+    target_y,
+    variogram_function,
+    eps=1e-10,
+    chunk_elements=CHUNK_ELEMENTS,
+):
+    """
+    全局普通克里金：克里金矩阵只做一次LU分解，所有目标点和所有变量列共用
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值，形状为 (n,) 或 (n, 变量数)
+    :param target_x: 目标点的X坐标（一维）
+    :param target_y: 目标点的Y坐标（一维）
+    :param variogram_function: 已拟合的变异函数（如 VariogramModel），输入距离返回半方差
+    :param eps: 判定目标点与数据点重合的距离阈值
+    :param chunk_elements: 单个分块的最大元素数，默认为 CHUNK_ELEMENTS
+    :return: 目标点的插值结果，形状为 (目标点数,) 或 (目标点数, 变量数)
+    """
+    from scipy.linalg import lu_factor, lu_solve
+    from scipy.spatial.distance import cdist
+
+    points = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+    z = np.asarray(z, dtype=float)
+    targets = np.column_stack(
+        (np.asarray(target_x, dtype=float), np.asarray(target_y, dtype=float))
+    )
+    n = len(points)
+    lu = lu_factor(_kriging_matrix(points, variogram_function))
+
+    result = np.empty((len(targets),) + z.shape[1:])
+    chunk = max(1, chunk_elements // (n + 1))
+    for start in range(0, len(targets), chunk):
+        dist = cdist(targets[start : start + chunk], points)
+        b = np.ones((n + 1, len(dist)))
+        b[:n] = -variogram_function(dist).T
+        b[:n][dist.T <= eps] = 0.0  # 与数据点重合时返回该点的值
+        weights = lu_solve(lu, b)
+        result[start : start + chunk] = weights[:n].T @ z
+    return result
+
+
+def _kriging_matrix(points, variogram_function):
+    from scipy.spatial.distance import cdist
+
+    # 克里金矩阵（与 pykrige 的约定一致：对角线为0，最后一行/列为拉格朗日约束）
+    n = len(points)
+    a = np.zeros((n + 1, n + 1))
+    a[:n, :n] = -variogram_function(cdist(points, points))
+    np.fill_diagonal(a, 0.0)
+    a[n, :n] = 1.0
+    a[:n, n] = 1.0
+    return a
+
+
+def batch_interpolate(method, x, y, values, grid_x, grid_y, **params):
+    """
+    多变量批量插值：对 (数据点数, 变量数) 的数值矩阵一次完成插值，返回堆叠的网格
+    三角剖分、IDW 距离与权重、克里金方程组的LU分解在各变量列之间共用；
+    克里金按列拟合变异函数，参数相同的列（或指定 variogram_parameters 时的全部列）共用同一方程组
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param values: 数据点的值，形状为 (n, 变量数)（如 DataFrame 的多列）
+    :param grid_x: 目标点的X坐标（任意形状）
+    :param grid_y: 目标点的Y坐标（与 grid_x 同形状）
+    :param params: 传递给对应插值函数的参数
+    :return: 形状为 grid_x.shape + (变量数,) 的插值结果
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    grid_x = np.asarray(grid_x, dtype=float)
+    grid_y = np.asarray(grid_y, dtype=float)
+    name = method.lower()
+    if name in ("nearest", "linear", "cubic"):
+        return scipy_interpolation(x, y, values, grid_x, grid_y, method=name, **params)
+    if name == "idw":
+        return idw_interpolation(x, y, values, grid_x, grid_y, **params)
+    if name == "kriging":
+        return _batch_kriging(x, y, values, grid_x, grid_y, **params)
+    raise ValueError(f"Unsupported interpolation method: {method}")
+
+
+def _batch_kriging(
+    x,
+    y,
+    values,
+    grid_x,
+    grid_y,
+    variogram_model="spherical",
+    variogram_parameters=None,
+    nlag=6,
+    weight=False,
+    n_closest_points=None,
+    max_distance=None,
+    style="points",
+):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if style == "grid":
+        grid_x, grid_y = np.meshgrid(grid_x, grid_y)
+    fit_index = None if n_closest_points is None else _variogram_fit_index(len(x))
+    # 按变异函数参数对变量列分组，同组的列共用一次求解
+    groups = {}
+    for column in range(values.shape[1]):
+        model = get_variogram_model(
+            x,
+            y,
+            values[:, column],
+            variogram_model=variogram_model,
+            variogram_parameters=variogram_parameters,
+            nlags=nlag,
+            weight=weight,
+            fit_index=fit_index,
+        )
+        key = repr([float(p) for p in model.parameters])
+        groups.setdefault(key, (model, []))[1].append(column)
+
+    grid_z = np.empty((grid_x.size, values.shape[1]))
+    for model, columns in groups.values():
+        if n_closest_points is None:
+            grid_z[:, columns] = global_kriging(
+                x, y, values[:, columns], grid_x.ravel(), grid_y.ravel(), model
+            )
+        else:
+            grid_z[:, columns] = local_kriging(
+                x,
+                y,
+                values[:, columns],
+                grid_x.ravel(),
+                grid_y.ravel(),
+                model,
+                n_closest_points,
+                max_distance,
+            )
+    return grid_z.reshape(grid_x.shape + (values.shape[1],))
+
+
+def interpolate(method, x, y, z, grid_x, grid_y, **params):
+    """
+    按方法名在任意形状的目标坐标上插值，返回与 grid_x 同形状的结果
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param grid_x: 目标点的X坐标（任意形状）
+    :param grid_y: 目标点的Y坐标（与 grid_x 同形状）
+    :param params: 传递给对应插值函数的参数
+    :return: 插值后的结果
+    """
+    name = method.lower()
+    if name in ("nearest", "linear", "cubic"):
+        return scipy_interpolation(x, y, z, grid_x, grid_y, method=name, **params)
+    if name == "idw":
+        return idw_interpolation(x, y, z, grid_x, grid_y, **params)
+    if name == "kriging":
+        return kriging_interpolation(
+            x, y, z, grid_x, grid_y, **{"style": "points", **params}
+        )
+    raise ValueError(f"Unsupported interpolation method: {method}")
@@ -0,0 +1,101 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+
+# 内存中保留的边界掩膜数量
+MASK_CACHE_SIZE = 16
+
+_masks = OrderedDict()
+
+
+def polygon_mask(grid_x, grid_y, polygon):
+    """
+    计算网格点是否位于多边形内部（与逐点调用 polygon.contains(Point) 的结果一致，边界上的点不算内部）
+    使用 shapely 2 的向量化 contains_xy，在预处理（prepared）后的多边形上一次判断全部格点
+    :param grid_x: 网格的X坐标
+    :param grid_y: 网格的Y坐标
+    :param polygon: shapely 多边形（可为 MultiPolygon，支持内部孔洞）
+    :return: 与 grid_x 同形状的布尔数组，多边形内部为True
+    """
+    grid_x = np.asarray(grid_x, dtype=float)
+    grid_y = np.asarray(grid_y, dtype=float)
+    # prepare 在原对象上建立空间索引，重复调用时不会重复构建
+    shapely.prepare(polygon)
+    return shapely.contains_xy(polygon, grid_x, grid_y)
+
+
+def boundary_mask(grid, boundary):
+    """
+    返回网格 grid 上位于边界内的格点掩膜（scanline_mask），按 (边界WKB哈希, 网格) 缓存（LRU淘汰），
+    同一场地重复生成插值图时不再重新计算
+    :param grid: 网格 GridSpec
+    :param boundary: shapely 多边形（可为 MultiPolygon）
+    :return: 形状为 (nx, ny) 的只读布尔数组
+    """
+    key = (hashlib.sha1(shapely.to_wkb(boundary)).hexdigest(), grid)
+    if key in _masks:
+        _masks.move_to_end(key)
+        return _masks[key]
+    mask = scanline_mask(grid, boundary)
+    mask.flags.writeable = False  # 缓存的掩膜由所有调用者共享
+    _masks[key] = mask
+    while len(_masks) > MASK_CACHE_SIZE:
+        _masks.popitem(last=False)
+    return mask
+
+
+def scanline_mask(grid, polygon):
+    """
+    扫描线（奇偶交点规则）栅格化：对每一行（固定X）求与多边形各边的交点，交点之间的格点为内部
+    复杂度约为 O(行数 × 边数 + 格点数)，适用于顶点很多、含多个部分和内部孔洞的边界；
+    结果与 polygon_mask 一致（边界上的格点不算内部）
+    :param grid: 网格 GridSpec
+    :param polygon: shapely 多边形（可为 MultiPolygon，支持内部孔洞）
+    :return: 形状为 (nx, ny) 的布尔数组
+    """
+    xs, ys = grid.axes()
+    # 所有环（外环与孔洞）的边
+    rings = shapely.get_rings(shapely.get_parts(polygon))
+    starts, ends = [], []
+    for ring in rings:
+        coords = shapely.get_coordinates(ring)
+        starts.append(coords[:-1])
+        ends.append(coords[1:])
+    starts = np.concatenate(starts) if starts else np.empty((0, 2))
+    ends = np.concatenate(ends) if ends else np.empty((0, 2))
+    x0, y0 = starts[:, 0], starts[:, 1]
+    x1, y1 = ends[:, 0], ends[:, 1]
+
+    # 每条边与 min(x0, x1) <= x < max(x0, x1) 的扫描线相交（半开区间，顶点只计一次）
+    first_row = np.searchsorted(xs, np.minimum(x0, x1), side="left")
+    last_row = np.searchsorted(xs, np.maximum(x0, x1), side="left")
+    counts = last_row - first_row
+    edge = np.repeat(np.arange(len(x0)), counts)
+    row = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    row += first_row[edge]
+    cross_y = y0[edge] + (xs[row] - x0[edge]) * (y1[edge] - y0[edge]) / (
+        x1[edge] - x0[edge]
+    )
+
+    # 每行的交点按Y排序后两两配对，配对区间内（不含端点）的格点位于内部
+    order = np.lexsort((cross_y, row))
+    row, cross_y = row[order], cross_y[order]
+    low_row, low_y, high_y = row[0::2], cross_y[0::2], cross_y[1::2]
+    low_y = low_y[: len(high_y)]
+    low_row = low_row[: len(high_y)]
+    first_col = np.searchsorted(ys, low_y, side="right")
+    last_col = np.searchsorted(ys, high_y, side="left")
+    # 同一行的配对区间互不重叠，累加值只可能为0或1，用 int8 即可（每格点1字节）
+    diff = np.zeros((grid.nx, grid.ny + 1), dtype=np.int8)
+    np.add.at(diff, (low_row, first_col), 1)
+    np.add.at(diff, (low_row, np.maximum(last_col, first_col)), -1)
+    mask = np.cumsum(diff[:, :-1], axis=1, dtype=np.int8) > 0
+
+    # 扫描线恰好经过顶点的行（如与网格对齐的竖直边）交给 contains_xy 逐行判断
+    degenerate = np.flatnonzero(np.isin(xs, np.concatenate([x0, x1])))
+    if degenerate.size:
+        grid_x, grid_y = np.meshgrid(xs[degenerate], ys, indexing="ij")
+        mask[degenerate] = polygon_mask(grid_x, grid_y, polygon)
+    return mask
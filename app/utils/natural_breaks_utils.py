@@ -0,0 +1,121 @@
+import numpy as np
+
+
+def _weighted_values(data):
+    """去除NaN后排序并合并重复值，返回 (唯一值, 重复次数)"""
+    data = np.asarray(data, dtype=float).ravel()
+    data = data[~np.isnan(data)]
+    if data.size == 0:
+        raise ValueError("data must contain at least one non-NaN value")
+    return np.unique(data, return_counts=True)
+
+
+def two_class_boundary(data):
+    """
+    一维数据的精确两类划分（使类内离差平方和最小，即一维 KMeans(n_clusters=2) 的全局最优解）
+    排序后用前缀和在 O(n) 时间内比较所有分割位置（总复杂度 O(n log n)），结果确定、不依赖随机种子
+    :param data: 输入的一组数据（列表、NumPy 数组等），NaN 被忽略
+    :return: (boundary, centers)，boundary 为两类中心的平均值，centers 为升序的两类中心；
+        数据只有一个不同的值时两类中心相同
+    """
+    data = np.asarray(data, dtype=float).ravel()
+    values = np.sort(data[~np.isnan(data)])
+    if values.size == 0:
+        raise ValueError("data must contain at least one non-NaN value")
+    # 只在相邻的不同值之间分割（第 i 个值之后，i = 0 .. n-2）
+    splits = np.flatnonzero(values[1:] != values[:-1])
+    if splits.size == 0:
+        return values[0], np.array([values[0], values[0]])
+    # 减去均值以减小平方和相减时的舍入误差
+    shift = values.mean()
+    centered = values - shift
+    total = np.cumsum(centered)
+    square = np.cumsum(centered**2)
+    left_weight = splits + 1.0
+    left_sum, left_square = total[splits], square[splits]
+    right_weight = values.size - left_weight
+    right_sum = total[-1] - left_sum
+    right_square = square[-1] - left_square
+    sse = (
+        left_square
+        - left_sum**2 / left_weight
+        + right_square
+        - right_sum**2 / right_weight
+    )
+    best = int(np.argmin(sse))
+    centers = (
+        np.array(
+            [
+                left_sum[best] / left_weight[best],
+                right_sum[best] / right_weight[best],
+            ]
+        )
+        + shift
+    )
+    return np.mean(centers), centers
+
+
+def natural_breaks(data, n_classes):
+    """
+    一维数据的 Fisher-Jenks 自然断点（使各类离差平方和之和最小的精确 k 类划分）
+    动态规划按类数逐层计算，利用最优分割位置的单调性分治求解，复杂度约为 O(k·m·log m)（m 为不同值的个数）
+    :param data: 输入的一组数据，NaN 被忽略
+    :param n_classes: 类数，不超过不同值的个数
+    :return: (upper_bounds, centers)，upper_bounds 为各类的最大值（升序），centers 为各类的中心
+    """
+    values, counts = _weighted_values(data)
+    m = values.size
+    if not 1 <= n_classes <= m:
+        raise ValueError(
+            f"n_classes must be between 1 and the number of distinct values ({m}), "
+            f"got {n_classes}"
+        )
+    shift = np.average(values, weights=counts)
+    centered = values - shift
+    weight = np.concatenate([[0.0], np.cumsum(counts, dtype=float)])
+    total = np.concatenate([[0.0], np.cumsum(counts * centered)])
+    square = np.concatenate([[0.0], np.cumsum(counts * centered**2)])
+
+    def cost(start, end):
+        # 第 start..end-1 个唯一值为一类时的离差平方和（start、end 可为数组）
+        w = weight[end] - weight[start]
+        s = total[end] - total[start]
+        return square[end] - square[start] - s**2 / w
+
+    # previous[i]：前 i 个唯一值分为 k-1 类的最小离差平方和
+    previous = cost(0, np.arange(1, m + 1))
+    previous = np.concatenate([[np.inf], previous])
+    starts = np.zeros((n_classes, m + 1), dtype=np.int64)
+    for k in range(2, n_classes + 1):
+        current = np.full(m + 1, np.inf)
+
+        def solve(low, high, opt_low, opt_high):
+            # 计算 current[low..high]，最后一类的起点位于 [opt_low, opt_high]
+            if low > high:
+                return
+            mid = (low + high) // 2
+            candidates = np.arange(max(opt_low, k - 1), min(opt_high, mid - 1) + 1)
+            totals = previous[candidates] + cost(candidates, mid)
+            best = int(np.argmin(totals))
+            current[mid] = totals[best]
+            starts[k - 1, mid] = candidates[best]
+            solve(low, mid - 1, opt_low, candidates[best])
+            solve(mid + 1, high, candidates[best], opt_high)
+
+        solve(k, m, k - 1, m - 1)
+        previous = current
+
+    # 回溯各类的起止位置
+    bounds = [m]
+    for k in range(n_classes, 1, -1):
+        bounds.append(starts[k - 1, bounds[-1]])
+    bounds.append(0)
+    bounds = bounds[::-1]
+    upper_bounds = np.array([values[end - 1] for end in bounds[1:]])
+    centers = np.array(
+        [
+            (total[end] - total[start]) / (weight[end] - weight[start]) + shift
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+    )
+    return upper_bounds, centers
@@ -0,0 +1,87 @@
+import numpy as np
+
+from .surface_cache import cached_interpolation
+from .mask_utils import boundary_mask
+from . import surface_store
+
+# 逐级加密的层数（每一级分辨率翻倍，最后一级为目标分辨率）
+PROGRESSIVE_LEVELS = 4
+# 最粗一级网格的最小分辨率
+PROGRESSIVE_MIN_RESOLUTION = 20
+# 插值结果的精度，"float32" 可使大网格结果与缓存的内存占用减半（可在 settings.txt 中通过 SURFACE_PRECISION 配置）
+# 网格坐标始终为 float64：投影坐标（百万米量级）在 float32 下的分辨率约为0.25~0.5米，会明显改变插值结果和边界掩膜
+SURFACE_PRECISION = "float64"
+
+
+def progressive_grids(
+    grid, levels=PROGRESSIVE_LEVELS, min_resolution=PROGRESSIVE_MIN_RESOLUTION
+):
+    """
+    返回由粗到细的网格序列，每一级格点数翻倍，最后一级为目标网格
+    :param grid: 目标网格 GridSpec
+    :param levels: 层数
+    :param min_resolution: 最粗一级每个方向的最少格点数
+    :return: list[GridSpec]
+    """
+    grids = []
+    for level in reversed(range(levels)):
+        level_grid = grid.coarsened(2**level, min_resolution)
+        if not grids or level_grid.size > grids[-1].size:
+            grids.append(level_grid)
+    return grids
+
+
+def progressive_interpolation(
+    method,
+    x,
+    y,
+    z,
+    grid,
+    levels=PROGRESSIVE_LEVELS,
+    boundary=None,
+    dtype=None,
+    crs=None,
+    **params,
+):
+    """
+    由粗到细逐级插值的生成器：先快速返回粗网格结果，再依次返回更高分辨率的结果
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param grid: 目标网格 GridSpec（通常由 GridSpec.from_cell_size 生成）
+    :param levels: 层数，为1时只计算目标网格
+    :param boundary: 场地边界多边形，指定时只插值边界内的格点，边界外为NaN
+    :param dtype: 插值结果的精度（"float32" 或 "float64"），默认为 SURFACE_PRECISION
+    :param crs: 坐标系，大网格写入磁盘时记录在 header 中
+    :param params: 传递给对应插值函数的参数
+    :return: 依次生成 (grid_x, grid_y, grid_z)；网格单元数达到 surface_store.SURFACE_STORE_MIN_CELLS 时
+        结果分块写入磁盘（SurfaceStore），返回按步长抽稀后用于绘图的结果
+    """
+    dtype = np.dtype(dtype or SURFACE_PRECISION)
+    previous_store = None
+    for level_grid in progressive_grids(grid, levels):
+        if level_grid.size >= surface_store.SURFACE_STORE_MIN_CELLS:
+            store = surface_store.interpolate_to_store(
+                method,
+                x,
+                y,
+                z,
+                level_grid,
+                boundary=boundary,
+                crs=crs,
+                dtype=dtype,
+                **params,
+            )
+            # 更粗一级的结果已被本级替代，删除其磁盘文件（绘图使用的是读入内存的抽稀结果）
+            if previous_store is not None:
+                previous_store.delete()
+            previous_store = store
+            yield store.plot_view()
+            continue
+        grid_x, grid_y = level_grid.mesh()
+        mask = None if boundary is None else boundary_mask(level_grid, boundary)
+        grid_z = cached_interpolation(
+            method, x, y, z, grid_x, grid_y, mask=mask, dtype=dtype, **params
+        )
+        yield grid_x, grid_y, grid_z
@@ -61,6 +61,23 @@ def traverse_layout(layout: QLayout, callback):
     return collected
 
 
+def keep_window_alive(window):
+    """
+    持有无父对象的顶层窗口的引用（保存在 app.windows 中），窗口关闭时自动销毁并移除引用
+    :param window: QWidget
+    :return: window
+    """
+    app = QApplication.instance() or QApplication([])
+    if not hasattr(app, "windows"):
+        app.windows = []
+    window.setAttribute(Qt.WA_DeleteOnClose)  # 确保窗口关闭时自动销毁
+    window.destroyed.connect(
+        lambda obj, w=window: app.windows.remove(w) if w in app.windows else None
+    )
+    app.windows.append(window)
+    return window
+
+
 def show_multiple_plots(figs):
     """
     显示多个 Figure 对象，每个图表在独立窗口
@@ -76,7 +93,6 @@ def show_multiple_plots(figs):
     elif not isinstance(figs, list):
         raise TypeError("参数必须是 Figure 或 list[Figure] 类型")
     app = QApplication.instance() or QApplication([])
-    app.windows = []
     for i, fig in enumerate(figs):
         window = PlotWindow(fig)
         window.setWindowTitle(f"Plot {i+1} - {window.windowTitle()}")
@@ -84,13 +100,8 @@ def show_multiple_plots(figs):
         # 偏移窗口位置避免完全重叠
         if i > 0:
             window.move(window.x() + 30 * i, window.y() + 30 * i)
-        window.setAttribute(Qt.WA_DeleteOnClose)  # 确保窗口关闭时自动销毁
-        window.destroyed.connect(
-            lambda obj, w=window: app.windows.remove(w) if w in app.windows else None
-        )
-
+        keep_window_alive(window)
         window.show()
-        app.windows.append(window)
 
     app.exec()
 
@@ -0,0 +1,143 @@
+import json
+import tomllib
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+
+from .predefined_data import NIS_indicators
+
+
+class ScoreTable:
+    """
+    单个指标的评分表（经验值法）：分界值严格升序，得分数量=分界值数量+1，
+    每个分界值附带一个bool，表示该分界值是否属于右侧区间（左闭）
+    构造时完成校验并预先生成 NumPy 数组，之后逐点或按列评分都不再解析配置
+    """
+
+    def __init__(self, indicator, breakpoints, scores, unit=None):
+        """
+        :param indicator: 指标名，须为 NIS_indicators 中的名称
+        :param breakpoints: 分界值列表 [(分界值, 是否左闭), ...]
+        :param scores: 各区间得分，长度为 len(breakpoints) + 1
+        :param unit: 分界值的单位，评分前数据换算为该单位（见 unit_utils）；为 None 时不换算
+        """
+        names = [member.value.name for member in NIS_indicators]
+        if indicator not in names:
+            raise ValueError(
+                f"Unknown indicator {indicator!r}, expected one of {names}"
+            )
+        breakpoints = [(float(value), bool(incl)) for value, incl in breakpoints]
+        scores = list(scores)
+        if len(scores) != len(breakpoints) + 1:
+            raise ValueError(
+                f"{indicator}: expected {len(breakpoints) + 1} scores for "
+                f"{len(breakpoints)} breakpoints, got {len(scores)}"
+            )
+        values = np.array([value for value, _ in breakpoints], dtype=float)
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f"{indicator}: breakpoints must be finite")
+        if np.any(np.diff(values) <= 0):
+            raise ValueError(f"{indicator}: breakpoints must be strictly ascending")
+
+        self.indicator = indicator
+        self.unit = unit
+        self.breakpoints = values
+        self.left_inclusive = np.array([incl for _, incl in breakpoints], dtype=bool)
+        self.scores = np.array(scores, dtype=float)
+        # 逐点评分使用的Python序列，得分保持配置中的原始类型
+        self._breakpoint_list = values.tolist()
+        self._inclusive_list = self.left_inclusive.tolist()
+        self._score_list = scores
+
+    @classmethod
+    def from_dict(cls, indicator, config):
+        """由 {"breakpoint": [(分界值, 是否左闭), ...], "score": [...], "unit": ...} 格式的字典生成"""
+        return cls(indicator, config["breakpoint"], config["score"], config.get("unit"))
+
+    def to_dict(self):
+        config = {
+            "breakpoint": [
+                [value, incl]
+                for value, incl in zip(self._breakpoint_list, self._inclusive_list)
+            ],
+            "score": list(self._score_list),
+        }
+        if self.unit is not None:
+            config["unit"] = self.unit
+        return config
+
+    def score(self, value):
+        """
+        单个数值的得分
+        :param value: 指标测量值
+        :return: 得分
+        """
+        index = bisect_left(self._breakpoint_list, value)
+        if (
+            index < len(self._breakpoint_list)
+            and value == self._breakpoint_list[index]
+            and self._inclusive_list[index]
+        ):
+            index += 1
+        return self._score_list[index]
+
+    def __call__(self, values):
+        """
+        按列评分
+        :param values: 指标测量值数组，NaN视为缺失数据
+        :return: 浮点型得分数组，缺失数据的得分为NaN
+        """
+        values = np.asarray(values, dtype=float)
+        # 区间序号 = 小于该值的分界值数量，再加上恰好等于且左闭的分界值
+        index = np.searchsorted(self.breakpoints, values, side="left")
+        inside = index < len(self.breakpoints)
+        on_breakpoint = np.zeros(values.shape, dtype=bool)
+        on_breakpoint[inside] = (
+            values[inside] == self.breakpoints[index[inside]]
+        ) & self.left_inclusive[index[inside]]
+        result = self.scores[index + on_breakpoint]
+        result[np.isnan(values)] = np.nan
+        return result
+
+    def __repr__(self):
+        return (
+            f"ScoreTable({self.indicator!r}, breakpoints={self.to_dict()['breakpoint']}, "
+            f"scores={self._score_list}, unit={self.unit!r})"
+        )
+
+
+def compile_score_config(config):
+    """
+    将 {指标名: 评分表字典或 ScoreTable} 转换为 {指标名: ScoreTable}，已编译的评分表原样保留
+    :param config: 评分配置
+    :return: dict
+    """
+    compiled = {}
+    for indicator, table in config.items():
+        if not isinstance(table, ScoreTable):
+            table = ScoreTable.from_dict(indicator, table)
+        elif table.indicator != indicator:
+            raise ValueError(
+                f"Score table for {table.indicator!r} is bound to {indicator!r}"
+            )
+        compiled[indicator] = table
+    return compiled
+
+
+def load_score_config(path):
+    """
+    从 JSON 或 TOML 文件读取评分配置（如地区性的阈值），文件中每个指标一项：
+    {"Radon": {"breakpoint": [[15, true], [150, true], [1500, true]], "score": [11, 3, 1, 0],
+               "unit": "Bq/m³"}, ...}
+    :param path: .json 或 .toml 文件路径
+    :return: {指标名: ScoreTable}
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".toml":
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    return compile_score_config(config)
@@ -0,0 +1,132 @@
+import os
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from .interpolation_scheduler import parallel_interpolation
+
+# 插值算法变化时修改该值，使旧的缓存失效
+SURFACE_CACHE_VERSION = 1
+# 默认缓存目录与容量上限
+SURFACE_CACHE_DIR = Path.home() / ".sdphc" / "surface_cache"
+SURFACE_CACHE_MB = 512
+
+
+class SurfaceCache:
+    """
+    插值结果的磁盘缓存：以输入坐标、数值、网格、方法和参数的哈希为键，
+    网格保存为压缩的 .npz 文件，超过容量上限时删除最久未使用的文件
+    """
+
+    def __init__(self, cache_dir=SURFACE_CACHE_DIR, max_mb=SURFACE_CACHE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_mb = max_mb
+
+    @property
+    def enabled(self):
+        return self.max_mb > 0
+
+    @staticmethod
+    def make_key(
+        x, y, z, grid_x, grid_y, method, params=None, mask=None, dtype=np.float64
+    ):
+        digest = hashlib.sha1()
+        digest.update(
+            f"v{SURFACE_CACHE_VERSION}|{method.lower()}|{np.dtype(dtype).str}|".encode()
+        )
+        for array in (x, y, z, grid_x, grid_y):
+            array = np.ascontiguousarray(array, dtype=float)
+            digest.update(repr(array.shape).encode())
+            digest.update(array.tobytes())
+        if mask is not None:
+            digest.update(b"mask")
+            digest.update(np.packbits(np.asarray(mask, dtype=bool)).tobytes())
+        digest.update(repr(sorted((params or {}).items())).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key):
+        """返回缓存的网格，不存在时返回None"""
+        path = self._path(key)
+        if not self.enabled or not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                grid_z = data["grid_z"]
+            os.utime(path)  # 更新访问时间，用于LRU淘汰
+            return grid_z
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, grid_z):
+        if not self.enabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免中断时留下损坏的缓存
+            tmp_path = self.cache_dir / f"{key}.tmp.npz"
+            np.savez_compressed(tmp_path, grid_z=np.ma.filled(grid_z, np.nan))
+            os.replace(tmp_path, self._path(key))
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        """删除最久未使用的缓存文件，直到总大小不超过上限"""
+        files = []
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        limit = self.max_mb * 1024 * 1024
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+# 全局共享的插值结果缓存
+surface_cache = SurfaceCache()
+
+
+def cached_interpolation(
+    method, x, y, z, grid_x, grid_y, mask=None, dtype=np.float64, **params
+):
+    """
+    带磁盘缓存的插值：相同的输入直接读取缓存结果，否则调用 parallel_interpolation 计算并写入缓存
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param grid_x: 目标点的X坐标（任意形状）
+    :param grid_y: 目标点的Y坐标（与 grid_x 同形状）
+    :param mask: 与 grid_x 同形状的布尔数组，只插值为True的格点，默认为None（全部格点）
+    :param dtype: 插值结果的精度，默认为 np.float64
+    :param params: 传递给对应插值函数的参数
+    :return: 与 grid_x 同形状的插值结果
+    """
+    key = surface_cache.make_key(x, y, z, grid_x, grid_y, method, params, mask, dtype)
+    grid_z = surface_cache.get(key)
+    if grid_z is None:
+        grid_z = parallel_interpolation(
+            method, x, y, z, grid_x, grid_y, mask=mask, dtype=dtype, **params
+        )
+        surface_cache.put(key, grid_z)
+    return grid_z
@@ -0,0 +1,212 @@
+import json
+import math
+import hashlib
+import shutil
+import atexit
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .grid_utils import GridSpec
+from .mask_utils import boundary_mask
+from .interpolation_scheduler import parallel_interpolation
+
+# 网格单元数达到该值时插值结果写入磁盘（内存映射），不再整体放在内存中
+# （可在 settings.txt 中通过 SURFACE_STORE_MIN_CELLS 配置；网格单元数受 GRID_MAX_CELLS 限制，
+# 只有 GRID_MAX_CELLS 不小于该值时才会使用磁盘存储）
+SURFACE_STORE_MIN_CELLS = 4_000_000
+# 分块写入时每块的网格单元数
+SURFACE_STORE_BLOCK_CELLS = 1_048_576
+# 绘图时读取的最大网格单元数，超过时按步长抽稀
+PLOT_MAX_CELLS = 1_000_000
+
+HEADER_NAME = "header.json"
+DATA_NAME = "surface.npy"
+
+
+class SurfaceStore:
+    """
+    磁盘上的插值结果：目录内包含 surface.npy（以 numpy.memmap 读写，形状为 (nx, ny)）
+    和记录网格范围、格点数、坐标系与精度的 header.json
+    """
+
+    def __init__(self, path, grid, crs=None, data=None):
+        self.path = Path(path)
+        self.grid = grid
+        self.crs = crs
+        self.data = data
+
+    @classmethod
+    def create(cls, path, grid, crs=None, dtype=np.float64):
+        """
+        新建以NaN填充的结果文件
+        :param path: 存储目录
+        :param grid: 网格 GridSpec
+        :param crs: 坐标系（如 "EPSG:4547"），只记录在 header 中
+        :param dtype: 结果精度，默认为 np.float64
+        :return: SurfaceStore（可写）
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        data = np.lib.format.open_memmap(
+            path / DATA_NAME, mode="w+", dtype=np.dtype(dtype), shape=grid.shape
+        )
+        data[:] = np.nan
+        store = cls(path, grid, crs, data)
+        store._write_header()
+        return store
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """
+        打开已有的结果文件
+        :param path: 存储目录
+        :param mode: "r" 只读或 "r+" 读写
+        :return: SurfaceStore
+        """
+        path = Path(path)
+        with open(path / HEADER_NAME, "r", encoding="utf-8") as f:
+            header = json.load(f)
+        grid = GridSpec(header["bounds"], header["nx"], header["ny"])
+        data = np.load(path / DATA_NAME, mmap_mode=mode)
+        return cls(path, grid, header.get("crs"), data)
+
+    @classmethod
+    def open_complete(cls, path):
+        """打开已完整写入的结果文件（见 mark_complete），不存在或未写完时返回None"""
+        try:
+            with open(Path(path) / HEADER_NAME, "r", encoding="utf-8") as f:
+                complete = json.load(f).get("complete", False)
+            return cls.open(path) if complete else None
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_header(self, complete=False):
+        header = {
+            "bounds": list(self.grid.bounds),
+            "nx": self.grid.nx,
+            "ny": self.grid.ny,
+            "crs": None if self.crs is None else str(self.crs),
+            "dtype": self.data.dtype.str,
+            "complete": complete,
+        }
+        with open(self.path / HEADER_NAME, "w", encoding="utf-8") as f:
+            json.dump(header, f)
+
+    def mark_complete(self):
+        """写入全部结果后调用，之后相同输入的插值可直接复用该结果"""
+        self.flush()
+        self._write_header(complete=True)
+
+    def delete(self):
+        """释放内存映射并删除存储目录"""
+        self.data = None
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def row_blocks(self, block_cells=SURFACE_STORE_BLOCK_CELLS):
+        """按行（X方向）划分的写入分块，返回 slice 序列"""
+        rows = max(1, block_cells // self.grid.ny)
+        return [
+            slice(start, min(start + rows, self.grid.nx))
+            for start in range(0, self.grid.nx, rows)
+        ]
+
+    def read_window(self, rows=slice(None), cols=slice(None), step=1):
+        """
+        读取一个窗口（可按步长抽稀）到内存
+        :return: (grid_x, grid_y, grid_z)
+        """
+        rows = slice(rows.start, rows.stop, step)
+        cols = slice(cols.start, cols.stop, step)
+        xs, ys = self.grid.axes()
+        grid_x, grid_y = np.meshgrid(xs[rows], ys[cols], indexing="ij")
+        return grid_x, grid_y, np.array(self.data[rows, cols])
+
+    def plot_view(self, max_cells=PLOT_MAX_CELLS):
+        """读取用于绘图的整幅结果，单元数超过 max_cells 时按步长抽稀"""
+        step = max(1, math.ceil(math.sqrt(self.grid.size / max_cells)))
+        return self.read_window(step=step)
+
+    def flush(self):
+        self.data.flush()
+
+
+def _session_store_dir(key):
+    global _store_root
+    if _store_root is None:
+        _store_root = Path(tempfile.mkdtemp(prefix="sdphc_surfaces_"))
+        atexit.register(shutil.rmtree, _store_root, ignore_errors=True)
+    return _store_root / key
+
+
+def store_key(x, y, z, grid, method, params=None, boundary=None, dtype=np.float64):
+    """
+    由输入数据、网格、方法、参数和边界生成存储目录名，相同输入的插值结果共用同一目录
+    :return: 十六进制哈希字符串
+    """
+    digest = hashlib.sha1()
+    digest.update(
+        f"{method.lower()}|{np.dtype(dtype).str}|{grid.bounds}|{grid.nx}|{grid.ny}|".encode()
+    )
+    for array in (x, y, z):
+        array = np.ascontiguousarray(array, dtype=float)
+        digest.update(repr(array.shape).encode())
+        digest.update(array.tobytes())
+    if boundary is not None:
+        digest.update(b"boundary")
+        digest.update(boundary.wkb)
+    digest.update(repr(sorted((params or {}).items())).encode())
+    return digest.hexdigest()
+
+
+_store_root = None
+
+
+def interpolate_to_store(
+    method,
+    x,
+    y,
+    z,
+    grid,
+    path=None,
+    boundary=None,
+    crs=None,
+    dtype=np.float64,
+    block_cells=SURFACE_STORE_BLOCK_CELLS,
+    **params,
+):
+    """
+    按行分块插值并逐块写入磁盘，内存中只保留一个分块的坐标、掩膜和结果
+    :param method: 插值方法，见 INTERPOLATION_METHODS
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param grid: 目标网格 GridSpec
+    :param path: 存储目录，默认为本次运行的临时目录下按输入哈希命名的子目录（退出时删除），
+        其中已有完整结果时直接复用
+    :param boundary: 场地边界多边形，指定时只插值边界内的格点，边界外为NaN
+    :param crs: 坐标系，只记录在 header 中
+    :param dtype: 结果精度，默认为 np.float64
+    :param block_cells: 每个分块的网格单元数，默认为 SURFACE_STORE_BLOCK_CELLS
+    :param params: 传递给对应插值函数的参数
+    :return: SurfaceStore
+    """
+    if path is None:
+        path = _session_store_dir(
+            store_key(x, y, z, grid, method, params, boundary, dtype)
+        )
+        store = SurfaceStore.open_complete(path)
+        if store is not None:
+            return store
+    store = SurfaceStore.create(path, grid, crs=crs, dtype=dtype)
+    # 整幅掩膜为布尔数组（每格点1字节），从缓存获取后按分块切片
+    full_mask = None if boundary is None else boundary_mask(grid, boundary)
+    for rows in store.row_blocks(block_cells):
+        grid_x, grid_y = grid.mesh(rows)
+        mask = None if full_mask is None else full_mask[rows]
+        store.data[rows] = parallel_interpolation(
+            method, x, y, z, grid_x, grid_y, mask=mask, dtype=dtype, **params
+        )
+    store.mark_complete()
+    return store
@@ -0,0 +1,89 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.interpolate as spi
+from scipy.spatial import Delaunay, cKDTree
+
+# 内存中保留的三角剖分数量
+TRIANGULATION_CACHE_SIZE = 8
+
+
+class TriangulationInterpolator:
+    """
+    共享三角剖分的插值器：同一组数据点只做一次 Delaunay 三角剖分（最近邻只建一次KD树），
+    之后可对任意多列数值（各指标、各主成分、得分）进行 linear / cubic / nearest 插值
+    """
+
+    def __init__(self, x, y):
+        """
+        :param x: 数据点的X坐标
+        :param y: 数据点的Y坐标
+        """
+        self.points = np.column_stack(
+            (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        )
+        self._tri = None
+        self._tree = None
+
+    @property
+    def tri(self):
+        if self._tri is None:
+            self._tri = Delaunay(self.points)
+        return self._tri
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = cKDTree(self.points)
+        return self._tree
+
+    def __call__(self, values, grid_x, grid_y, method="linear", fill_value=np.nan):
+        """
+        :param values: 数据点的值，形状为 (n,) 或 (n, 变量数)
+        :param grid_x: 目标点的X坐标（任意形状）
+        :param grid_y: 目标点的Y坐标（与 grid_x 同形状）
+        :param method: 'nearest'、'linear' 或 'cubic'，默认为 'linear'
+        :param fill_value: 凸包外目标点的填充值（nearest 不使用），默认为NaN
+        :return: 形状为 grid_x.shape 或 grid_x.shape + (变量数,) 的插值结果
+        """
+        values = np.asarray(values)
+        grid_x = np.asarray(grid_x, dtype=float)
+        targets = np.column_stack((grid_x.ravel(), np.asarray(grid_y).ravel()))
+        if method == "nearest":
+            _, idx = self.tree.query(targets)
+            result = values[idx]
+        elif method == "linear":
+            result = spi.LinearNDInterpolator(self.tri, values, fill_value)(targets)
+        elif method == "cubic":
+            result = spi.CloughTocher2DInterpolator(self.tri, values, fill_value)(
+                targets
+            )
+        else:
+            raise ValueError(f"Unsupported interpolation method: {method}")
+        return result.reshape(grid_x.shape + values.shape[1:])
+
+
+_triangulations = OrderedDict()
+
+
+def get_triangulation(x, y, maxsize=TRIANGULATION_CACHE_SIZE):
+    """
+    按数据点坐标返回缓存的 TriangulationInterpolator，不存在时创建并写入缓存（LRU淘汰）
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param maxsize: 缓存的最大数量，默认为 TRIANGULATION_CACHE_SIZE
+    :return: TriangulationInterpolator
+    """
+    digest = hashlib.sha1()
+    for array in (x, y):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    key = digest.hexdigest()
+    if key in _triangulations:
+        _triangulations.move_to_end(key)
+        return _triangulations[key]
+    interpolator = TriangulationInterpolator(x, y)
+    _triangulations[key] = interpolator
+    while len(_triangulations) > maxsize:
+        _triangulations.popitem(last=False)
+    return interpolator
@@ -0,0 +1,55 @@
+import numpy as np
+
+# 体积分数单位相对于 v/v（体积比）的十进制指数；用整数指数换算，
+# 以便按 10 的整数次幂做乘除，结果与手工 x / 1000 等写法逐位一致
+VOLUME_FRACTION_EXPONENTS = {"v/v": 0, "%": -2, "ppm": -6, "ppb": -9}
+
+
+def unit_conversion(source_unit, target_unit):
+    """
+    返回把 source_unit 的数值换算为 target_unit 的运算
+    :param source_unit: 数据的单位
+    :param target_unit: 目标单位；为 None 时不换算
+    :return: (operation, scale)，operation 为 "multiply"、"divide" 或 None（无需换算）
+    """
+    if target_unit is None or source_unit == target_unit:
+        return None, 1
+    if (
+        source_unit not in VOLUME_FRACTION_EXPONENTS
+        or target_unit not in VOLUME_FRACTION_EXPONENTS
+    ):
+        raise ValueError(f"Cannot convert {source_unit!r} to {target_unit!r}")
+    exponent = (
+        VOLUME_FRACTION_EXPONENTS[source_unit] - VOLUME_FRACTION_EXPONENTS[target_unit]
+    )
+    if exponent == 0:
+        return None, 1
+    if exponent > 0:
+        return "multiply", 10**exponent
+    return "divide", 10**-exponent
+
+
+def normalize_units(data, source_units, target_units):
+    """
+    按列把数据换算为目标单位（在 data 上原地修改），每列一次原地的向量化乘除，不另外分配结果数组
+    :param data: DataFrame，列为指标名
+    :param source_units: {指标名: 数据单位}
+    :param target_units: {指标名: 目标单位}，目标单位为 None 的指标不换算
+    :return: data
+    """
+    for column, target_unit in target_units.items():
+        if column not in data or column not in source_units:
+            continue
+        operation, scale = unit_conversion(source_units[column], target_unit)
+        if operation is None:
+            continue
+        # 非浮点列转换时已复制；浮点列为只读视图（Copy-on-Write）时复制一次，之后原地乘除
+        values = data[column].to_numpy(dtype=float)
+        if not values.flags.writeable:
+            values = values.copy()
+        if operation == "multiply":
+            np.multiply(values, scale, out=values)
+        else:
+            np.divide(values, scale, out=values)
+        data[column] = values
+    return data
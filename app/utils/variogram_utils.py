@@ -0,0 +1,278 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from pykrige.ok import OrdinaryKriging
+
+# 内存中保留的已拟合变异函数数量
+VARIOGRAM_CACHE_SIZE = 16
+
+# pykrige 以列表传入这些模型的参数时按 [sill, range, nugget] 解释（psill = sill - nugget），
+# 而拟合结果 variogram_model_parameters 为 [psill, range, nugget]
+SILL_MODELS = ("gaussian", "spherical", "exponential", "hole-effect")
+
+
+def variogram_parameters_dict(variogram_model, parameters):
+    """
+    将拟合得到的参数列表（pykrige 的 variogram_model_parameters 格式）转换为
+    可原样传回 OrdinaryKriging(variogram_parameters=...) 的形式
+    :param variogram_model: 变异函数模型
+    :param parameters: [psill, range, nugget]、[slope, nugget] 或 [scale, exponent, nugget]
+    :return: dict；自定义变异函数返回原列表
+    """
+    parameters = [float(p) for p in parameters]
+    if variogram_model in SILL_MODELS:
+        return dict(zip(("psill", "range", "nugget"), parameters))
+    if variogram_model == "linear":
+        return dict(zip(("slope", "nugget"), parameters))
+    if variogram_model == "power":
+        return dict(zip(("scale", "exponent", "nugget"), parameters))
+    return parameters
+
+
+class VariogramModel:
+    """
+    已拟合的变异函数（普通克里金）模型
+    同一组数据点只拟合一次，之后可在不同网格上反复调用 execute
+    """
+
+    def __init__(
+        self,
+        x,
+        y,
+        z,
+        variogram_model="spherical",
+        variogram_parameters=None,
+        nlags=6,
+        weight=False,
+        fit_index=None,
+    ):
+        """
+        :param x: 数据点的X坐标
+        :param y: 数据点的Y坐标
+        :param z: 数据点的值（对应的Z值）
+        :param variogram_model: 变异函数模型，默认为 "spherical"
+        :param variogram_parameters: 变异函数的参数，为None时自动拟合
+        :param nlags: 半变异函数的平均区间数，默认为6
+        :param weight: 是否加权处理小的滞后距离，默认为False
+        :param fit_index: 用于拟合的数据点索引，默认为None（全部点）
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.z = np.asarray(z, dtype=float)
+        self.variogram_model = variogram_model
+        self.nlags = nlags
+        self.weight = weight
+        self.fit_index = fit_index
+        self._full_ok = None
+        self._lock = threading.Lock()
+        if fit_index is None:
+            fit_x, fit_y, fit_z = self.x, self.y, self.z
+        else:
+            fit_x, fit_y, fit_z = (
+                self.x[fit_index],
+                self.y[fit_index],
+                self.z[fit_index],
+            )
+        self.ok = OrdinaryKriging(
+            fit_x,
+            fit_y,
+            fit_z,
+            variogram_model=variogram_model,
+            variogram_parameters=variogram_parameters,
+            nlags=nlags,
+            weight=weight,
+            verbose=False,
+            enable_plotting=False,
+        )
+        self.parameters = list(self.ok.variogram_model_parameters)
+
+    def __call__(self, d):
+        """返回距离 d 处的半方差"""
+        return self.ok.variogram_function(self.parameters, d)
+
+    def __repr__(self):
+        return f"VariogramModel(model={self.variogram_model}, parameters={self.parameters})"
+
+    @property
+    def variogram_parameters(self):
+        """可原样传给 OrdinaryKriging(variogram_parameters=...) 的拟合参数"""
+        return variogram_parameters_dict(self.variogram_model, self.parameters)
+
+    def execute(self, style, xpoints, ypoints):
+        """
+        使用已拟合的变异函数在全部数据点上执行全局克里金（可在多个线程中同时调用）
+        :param style: "grid" 或 "points"，与 pykrige 一致
+        :param xpoints: 目标X坐标
+        :param ypoints: 目标Y坐标
+        :return: (插值结果, 克里金方差)
+        """
+        return self._global_ok().execute(style, xpoints, ypoints)
+
+    def _global_ok(self):
+        if self.fit_index is None:
+            return self.ok
+        # 拟合时使用了抽样点，全局求解需要全部数据点，沿用已拟合的参数（只构建一次）
+        with self._lock:
+            if self._full_ok is None:
+                self._full_ok = OrdinaryKriging(
+                    self.x,
+                    self.y,
+                    self.z,
+                    variogram_model=self.variogram_model,
+                    variogram_parameters=self.variogram_parameters,
+                    nlags=self.nlags,
+                    weight=self.weight,
+                    verbose=False,
+                    enable_plotting=False,
+                )
+            return self._full_ok
+
+
+class VariogramCache:
+    """
+    按 (坐标, 数值, 模型, nlags, weight) 缓存已拟合的变异函数，内存中按LRU淘汰；
+    设置 cache_dir 后拟合参数同时保存到磁盘，重启软件后仍可复用
+    """
+
+    def __init__(self, maxsize=VARIOGRAM_CACHE_SIZE, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._models = OrderedDict()
+        # 多个界面线程可能同时读写缓存
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        x, y, z, variogram_model, variogram_parameters, nlags, weight, fit_index
+    ):
+        digest = hashlib.sha1()
+        for array in (x, y, z):
+            digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+        if fit_index is not None:
+            digest.update(np.ascontiguousarray(fit_index, dtype=np.int64).tobytes())
+        digest.update(
+            repr((variogram_model, variogram_parameters, nlags, weight)).encode()
+        )
+        return digest.hexdigest()
+
+    def get(
+        self,
+        x,
+        y,
+        z,
+        variogram_model="spherical",
+        variogram_parameters=None,
+        nlags=6,
+        weight=False,
+        fit_index=None,
+    ) -> VariogramModel:
+        """返回缓存中的变异函数模型，不存在时拟合并写入缓存"""
+        key = self.make_key(
+            x, y, z, variogram_model, variogram_parameters, nlags, weight, fit_index
+        )
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+
+        stored_parameters = self._load(key)
+        if stored_parameters is not None:
+            stored_parameters = variogram_parameters_dict(
+                variogram_model, stored_parameters
+            )
+        model = VariogramModel(
+            x,
+            y,
+            z,
+            variogram_model=variogram_model,
+            variogram_parameters=(
+                variogram_parameters if stored_parameters is None else stored_parameters
+            ),
+            nlags=nlags,
+            weight=weight,
+            fit_index=fit_index,
+        )
+        if stored_parameters is None:
+            self._save(key, model)
+        with self._lock:
+            # 其他线程可能已拟合同一模型，沿用先写入的实例
+            model = self._models.setdefault(key, model)
+            self._models.move_to_end(key)
+            while len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def _path(self, key):
+        return Path(self.cache_dir) / f"{key}.json"
+
+    def _load(self, key):
+        if self.cache_dir is None or not self._path(key).exists():
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["parameters"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, model):
+        # 自定义变异函数无法序列化，只保存内置模型
+        if self.cache_dir is None or not isinstance(model.variogram_model, str):
+            return
+        try:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "variogram_model": model.variogram_model,
+                        "parameters": [float(p) for p in model.parameters],
+                    },
+                    f,
+                )
+        except OSError:
+            pass
+
+
+# 全局共享的变异函数缓存
+variogram_cache = VariogramCache()
+
+
+def get_variogram_model(
+    x,
+    y,
+    z,
+    variogram_model="spherical",
+    variogram_parameters=None,
+    nlags=6,
+    weight=False,
+    fit_index=None,
+) -> VariogramModel:
+    """
+    从全局缓存获取已拟合的变异函数模型
+    :param x: 数据点的X坐标
+    :param y: 数据点的Y坐标
+    :param z: 数据点的值（对应的Z值）
+    :param variogram_model: 变异函数模型，默认为 "spherical"
+    :param variogram_parameters: 变异函数的参数，为None时自动拟合
+    :param nlags: 半变异函数的平均区间数，默认为6
+    :param weight: 是否加权处理小的滞后距离，默认为False
+    :param fit_index: 用于拟合的数据点索引，默认为None（全部点）
+    :return: VariogramModel
+    """
+    return variogram_cache.get(
+        x,
+        y,
+        z,
+        variogram_model=variogram_model,
+        variogram_parameters=variogram_parameters,
+        nlags=nlags,
+        weight=weight,
+        fit_index=fit_index,
+    )
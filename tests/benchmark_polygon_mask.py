@@ -0,0 +1,91 @@
+"""
+边界掩膜计算的性能对比：
+- 逐格点 polygon.contains(Point)（原 mask_with_polygon 的做法）
+- polygon_mask（shapely.contains_xy 向量化）
+- scanline_mask（扫描线奇偶规则栅格化）
+
+用法（在项目根目录）：python tests/benchmark_polygon_mask.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point, Polygon
+from shapely.ops import unary_union
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils import GridSpec, polygon_mask, scanline_mask, Drawing_specifications
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+
+def contains_loop_mask(grid_x, grid_y, polygon):
+    mask = np.zeros(grid_x.shape, dtype=bool)
+    for index in np.ndindex(grid_x.shape):
+        if polygon.contains(Point(grid_x[index], grid_y[index])):
+            mask[index] = True
+    return mask
+
+
+def complex_boundary(n_vertices=4000, seed=0):
+    """多部分、含孔洞、顶点很多的合成边界"""
+    rng = np.random.default_rng(seed)
+
+    def blob(cx, cy, r, n):
+        t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        rr = r * (1 + 0.3 * np.sin(7 * t) + 0.05 * rng.random(n))
+        return Polygon(np.column_stack((cx + rr * np.cos(t), cy + rr * np.sin(t))))
+
+    holes = unary_union([blob(200, 100, 120, 500), blob(-300, -200, 150, 500)])
+    return unary_union(
+        [
+            blob(0, 0, 1000, n_vertices).difference(holes),
+            blob(2500, 0, 600, n_vertices // 2),
+        ]
+    )
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    boundaries = {}
+    for site in ("LX", "JN"):
+        boundary_gdf = gpd.read_file(TESTS_DIR / f"{site}_boundary.gpkg").to_crs(
+            epsg=Drawing_specifications.EPSG_code
+        )
+        boundaries[site] = unary_union(boundary_gdf.geometry)
+    boundaries["complex"] = complex_boundary()
+
+    print(
+        f"{'boundary':<10}{'grid':>11}{'loop (s)':>11}{'contains_xy (s)':>17}"
+        f"{'scanline (s)':>14}{'identical':>11}"
+    )
+    for name, boundary in boundaries.items():
+        for resolution in (100, 300, 1000):
+            grid = GridSpec(boundary.bounds, resolution, resolution)
+            grid_x, grid_y = grid.mesh()
+            vectorized, vectorized_time = timed(polygon_mask, grid_x, grid_y, boundary)
+            scanline, scanline_time = timed(scanline_mask, grid, boundary)
+            identical = np.array_equal(vectorized, scanline)
+            if resolution <= 300:
+                loop, loop_time = timed(contains_loop_mask, grid_x, grid_y, boundary)
+                identical = identical and np.array_equal(loop, scanline)
+                loop_text = f"{loop_time:.3f}"
+            else:
+                loop_text = "-"
+            print(
+                f"{name:<10}{f'{resolution}x{resolution}':>11}{loop_text:>11}"
+                f"{vectorized_time:>17.4f}{scanline_time:>14.4f}{str(identical):>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
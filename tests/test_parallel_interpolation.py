@@ -0,0 +1,77 @@
+"""
+并行插值的调度检查：默认网格设置（GRID_CELL_SIZE、GRID_MAX_CELLS）下达到上限的网格，
+经边界掩膜后仍在进程池中分块计算，且结果与单进程计算一致
+
+用法（在项目根目录）：python -m pytest tests/test_parallel_interpolation.py
+或：python tests/test_parallel_interpolation.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import Point
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils import GridSpec, parallel_interpolation
+from utils import interpolation_scheduler
+from utils.grid_utils import GRID_MAX_CELLS
+from utils.mask_utils import boundary_mask
+
+
+def default_masked_grid():
+    """2 km × 2 km 的场地按默认单元边长生成网格（达到 GRID_MAX_CELLS 上限），圆形边界掩膜"""
+    boundary = Point(1000, 1000).buffer(1000)
+    grid = GridSpec.from_cell_size(boundary.bounds)
+    grid_x, grid_y = grid.mesh()
+    return grid, grid_x, grid_y, boundary_mask(grid, boundary)
+
+
+def synthetic_points(n_points=300, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 2000, n_points)
+    y = rng.uniform(0, 2000, n_points)
+    z = np.sin(x / 300) * np.cos(y / 400) + rng.normal(0, 0.05, n_points)
+    return x, y, z
+
+
+def test_default_masked_grid_uses_pool(monkeypatch):
+    grid, grid_x, grid_y, mask = default_masked_grid()
+    assert grid.size <= GRID_MAX_CELLS
+    assert mask.sum() >= interpolation_scheduler.PARALLEL_MIN_CELLS
+
+    calls = []
+    get_executor = interpolation_scheduler._get_executor
+
+    def spy(n_workers):
+        calls.append(n_workers)
+        return get_executor(n_workers)
+
+    monkeypatch.setattr(interpolation_scheduler, "_get_executor", spy)
+    x, y, z = synthetic_points()
+    parallel = parallel_interpolation(
+        "IDW", x, y, z, grid_x, grid_y, n_workers=2, mask=mask, power=2
+    )
+    assert calls == [2]
+
+    serial = parallel_interpolation(
+        "IDW", x, y, z, grid_x, grid_y, n_workers=1, mask=mask, power=2
+    )
+    assert len(calls) == 1
+    np.testing.assert_array_equal(np.isnan(parallel), ~mask)
+    # 分块大小不同，矩阵运算的舍入可能有末位差异
+    np.testing.assert_allclose(parallel, serial, rtol=1e-12)
+
+
+def main():
+    grid, grid_x, grid_y, mask = default_masked_grid()
+    print(
+        f"grid {grid.nx}×{grid.ny} = {grid.size} cells, {int(mask.sum())} inside the "
+        f"boundary, PARALLEL_MIN_CELLS = {interpolation_scheduler.PARALLEL_MIN_CELLS}, "
+        f"TILE_CELLS = {interpolation_scheduler.TILE_CELLS}"
+    )
+
+
+if __name__ == "__main__":
+    main()
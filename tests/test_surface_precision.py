@@ -0,0 +1,88 @@
+"""
+插值结果精度（SURFACE_PRECISION）的一致性检查：
+float32 与 float64 的插值曲面在容差内一致，且 NaN（边界外、凸包外）的位置完全相同
+
+用法（在项目根目录）：python -m pytest tests/test_surface_precision.py
+或：python tests/test_surface_precision.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from shapely.geometry import Point
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils import GridSpec, progressive_interpolation, surface_cache
+
+# float32 的相对精度约为 1.2e-7，插值本身仍以 float64 计算，只在输出时转换
+RTOL = 1e-6
+
+METHODS = (
+    ("IDW", {"power": 2}),
+    ("Linear", {}),
+    ("Kriging", {"variogram_model": "spherical"}),
+    ("Kriging", {"variogram_model": "exponential", "n_closest_points": 12}),
+)
+
+
+def synthetic_site(n_points=200, seed=0):
+    """合成的数据点（场地中心附近）与圆形边界，边界的一部分位于数据点凸包之外"""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(100, 900, n_points)
+    y = rng.uniform(100, 900, n_points)
+    z = 50 + 20 * np.sin(x / 150) * np.cos(y / 200) + rng.normal(0, 1, n_points)
+    boundary = Point(500, 500).buffer(480)
+    return x, y, z, boundary
+
+
+def surface(method, x, y, z, grid, boundary, dtype, **params):
+    ((_, _, grid_z),) = progressive_interpolation(
+        method, x, y, z, grid, levels=1, boundary=boundary, dtype=dtype, **params
+    )
+    return np.asarray(grid_z)
+
+
+@pytest.fixture(autouse=True)
+def no_surface_cache(monkeypatch):
+    # 每次都重新插值，且不写入用户的缓存目录
+    monkeypatch.setattr(surface_cache, "max_mb", 0)
+
+
+@pytest.mark.parametrize("method, params", METHODS)
+def test_float32_matches_float64(method, params):
+    x, y, z, boundary = synthetic_site()
+    grid = GridSpec(boundary.bounds, 120, 100)
+    single = surface(method, x, y, z, grid, boundary, "float32", **params)
+    double = surface(method, x, y, z, grid, boundary, "float64", **params)
+
+    assert single.dtype == np.float32
+    assert double.dtype == np.float64
+    np.testing.assert_array_equal(np.isnan(single), np.isnan(double))
+    assert np.isnan(double).any() and not np.isnan(double).all()
+    valid = ~np.isnan(double)
+    np.testing.assert_allclose(single[valid], double[valid], rtol=RTOL)
+
+
+def main():
+    surface_cache.max_mb = 0
+    x, y, z, boundary = synthetic_site()
+    grid = GridSpec(boundary.bounds, 120, 100)
+    for method, params in METHODS:
+        single = surface(method, x, y, z, grid, boundary, "float32", **params)
+        double = surface(method, x, y, z, grid, boundary, "float64", **params)
+        valid = ~np.isnan(double)
+        deviation = np.max(
+            np.abs(single[valid] - double[valid]) / np.abs(double[valid])
+        )
+        same_mask = np.array_equal(np.isnan(single), np.isnan(double))
+        print(
+            f"{method:8s} {str(params):50s} "
+            f"max relative deviation {deviation:.2e}, same NaN mask: {same_mask}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+磁盘插值结果（SurfaceStore）的检查：逐级加密时只保留最后一级的存储目录，
+相同输入再次插值时复用已写完的结果，不再新建目录
+
+用法（在项目根目录）：python -m pytest tests/test_surface_store.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import Point
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils import GridSpec, progressive_interpolation, surface_cache
+from utils import surface_store
+
+
+def store_dirs(root):
+    return sorted(path for path in Path(root).iterdir() if path.is_dir())
+
+
+def test_progressive_levels_keep_one_store(monkeypatch, tmp_path):
+    # 所有级别都写入磁盘，且存储目录位于临时目录中
+    monkeypatch.setattr(surface_store, "SURFACE_STORE_MIN_CELLS", 1)
+    monkeypatch.setattr(surface_store, "_store_root", tmp_path)
+    monkeypatch.setattr(surface_cache, "max_mb", 0)
+
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 100, 50), rng.uniform(0, 100, 50)
+    z = x + y
+    boundary = Point(50, 50).buffer(50)
+    grid = GridSpec(boundary.bounds, 160, 160)
+
+    first = list(
+        progressive_interpolation("IDW", x, y, z, grid, levels=3, boundary=boundary)
+    )
+    assert len(first) == 3
+    dirs = store_dirs(tmp_path)
+    assert len(dirs) == 1
+    modified = (dirs[0] / surface_store.DATA_NAME).stat().st_mtime_ns
+
+    second = list(
+        progressive_interpolation("IDW", x, y, z, grid, levels=3, boundary=boundary)
+    )
+    # 较粗的级别重新计算后删除，最后一级复用已有结果
+    assert store_dirs(tmp_path) == dirs
+    assert (dirs[0] / surface_store.DATA_NAME).stat().st_mtime_ns == modified
+    np.testing.assert_array_equal(first[-1][2], second[-1][2])